@@ -1,32 +1,41 @@
-"""Public package exports for IPAnalyzer."""
-from .modules.ip_utils import IPUtils
-from .modules.geoip_analyzer import GeoIPAnalyzer
-from .modules.bgp_analyzer import BGPAnalyzer
-from .modules.dns_bulk_processor import DNSBulkProcessor
-from .modules.threat_intelligence import ThreatIntelligence, ThreatIntel
-from .modules.report_generator import ReportGenerator
-from .modules.whois_analyzer import WHOISAnalyzer
-from .modules.ip_range_analyzer import IPRangeAnalyzer
-from .modules.network_scanner import NetworkScanner
-from .storage.database_manager import DatabaseManager
-from .plugins.plugin_manager import PluginManager
-from .gui.desktop_app import DesktopApp
-
-__all__ = [
-    "IPUtils",
-    "GeoIPAnalyzer",
-    "BGPAnalyzer",
-    "DNSBulkProcessor",
-    "ThreatIntelligence",
-    "ThreatIntel",
-    "ReportGenerator",
-    "WHOISAnalyzer",
-    "IPRangeAnalyzer",
-    "NetworkScanner",
-    "DatabaseManager",
-    "PluginManager",
-    "DesktopApp",
-]
+"""Public package exports for IPAnalyzer.
+
+Exports are imported on first attribute access (PEP 562), so importing one
+submodule or running a single CLI command does not load every analyzer,
+the database layer and the GUI toolkit.
+"""
+import importlib
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "IPUtils": ".modules.ip_utils",
+    "GeoIPAnalyzer": ".modules.geoip_analyzer",
+    "BGPAnalyzer": ".modules.bgp_analyzer",
+    "DNSBulkProcessor": ".modules.dns_bulk_processor",
+    "ThreatIntelligence": ".modules.threat_intelligence",
+    "ThreatIntel": ".modules.threat_intelligence",
+    "ReportGenerator": ".modules.report_generator",
+    "WHOISAnalyzer": ".modules.whois_analyzer",
+    "IPRangeAnalyzer": ".modules.ip_range_analyzer",
+    "NetworkScanner": ".modules.network_scanner",
+    "DatabaseManager": ".storage.database_manager",
+    "PluginManager": ".plugins.plugin_manager",
+    "DesktopApp": ".gui.desktop_app",
+}
+
+__all__ = list(_EXPORTS)
 
 __version__ = "2.5.0"
 
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
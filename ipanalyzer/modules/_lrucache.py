@@ -0,0 +1,54 @@
+"""Bounded least-recently-used mapping for per-IP result caches."""
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Mapping-like cache that keeps at most `maxsize` entries.
+
+    get() marks an entry as recently used; inserting past the limit evicts
+    the least recently used one. Only the operations the analyzers need are
+    exposed, so no inherited dict method can bypass or disturb the order.
+    """
+
+    __slots__ = ('maxsize', '_data')
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        data = self._data
+        try:
+            value = data[key]
+            data.move_to_end(key)
+        except KeyError:  # absent, or evicted by another thread meanwhile
+            return default
+        return value
+
+    def __setitem__(self, key, value):
+        data = self._data
+        data[key] = value
+        data.move_to_end(key)
+        if len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def copy(self) -> 'LRUCache':
+        new = LRUCache(self.maxsize)
+        new._data = self._data.copy()
+        return new
+
+    def __repr__(self) -> str:
+        return f"LRUCache({dict(self._data)!r})"
@@ -0,0 +1,24 @@
+"""Cheap UTC timestamp formatting for per-record bookkeeping."""
+import time
+
+# (epoch second, formatted 'YYYY-MM-DDTHH:MM:SS') of the last call
+_last_second = (-1, '')
+
+
+def utc_now_iso(aware: bool = False) -> str:
+    """
+    Current UTC time in datetime.isoformat() layout with microseconds.
+
+    The second-resolution part is formatted at most once per second and
+    reused; only the fractional part is rendered per call. With aware=True
+    a '+00:00' offset is appended, matching datetime.now(timezone.utc).
+    """
+    global _last_second
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    cached_sec, prefix = _last_second
+    if sec != cached_sec:
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(sec))
+        _last_second = (sec, prefix)
+    if aware:
+        return f'{prefix}.{ns // 1000:06d}+00:00'
+    return f'{prefix}.{ns // 1000:06d}'
@@ -7,6 +7,8 @@ by older tests and callers.
 from typing import Dict, List, Optional, Tuple, Set
 import ipaddress
 
+from ._lrucache import LRUCache
+
 
 class BGPAnalyzer:
     # Small sample prefix table: (start_int, end_int, asn, name)
@@ -24,11 +26,12 @@ class BGPAnalyzer:
 
     def __init__(self, prefixes: Optional[List[Tuple]] = None):
         self.prefixes = prefixes if prefixes is not None else self._SAMPLE_PREFIXES
-        self._cache: Dict[str, Dict] = {}
+        self._cache: Dict[str, Dict] = LRUCache()
 
     def analyze_ip(self, ip: str) -> Dict:
-        if ip in self._cache:
-            return self._cache[ip].copy()
+        cached = self._cache.get(ip)
+        if cached is not None:
+            return cached.copy()
         try:
             ipa = ipaddress.ip_address(ip)
             ip_int = int(ipa)
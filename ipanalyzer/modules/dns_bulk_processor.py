@@ -46,11 +46,20 @@ class DNSBulkProcessor:
 DNS Bulk Processor - Multi-threaded DNS lookup and resolution module
 Provides batch forward and reverse DNS processing with caching and export capabilities.
 """
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
+import asyncio
 import socket
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+try:
+    # Optional: native asyncio PTR queries, so reverse lookups never occupy a thread
+    import dns.asyncresolver as _dns_async
+    import dns.exception as _dns_exc
+    import dns.resolver as _dns_resolver
+except ImportError:
+    _dns_async = None
+
 
 class DNSBulkProcessor:
     """
@@ -188,6 +197,141 @@ class DNSBulkProcessor:
                 results[result.get('ip')] = result
         return results
 
+    def _store(self, cache_key: str, result: Dict, stat: str) -> Dict:
+        """Cache a lookup result, count it and return a copy."""
+        self._cache[cache_key] = result
+        self._stats[stat] += 1
+        return result.copy()
+
+    def _async_resolver(self):
+        """dnspython asyncio resolver for PTR queries, or None to use the thread pool."""
+        if _dns_async is None:
+            return None
+        resolver = _dns_async.Resolver()
+        resolver.lifetime = self.timeout
+        return resolver
+
+    async def _run_blocking(self, executor: ThreadPoolExecutor, func, *args):
+        """
+        Run a blocking lookup on `executor` and wait at most self.timeout for it.
+        
+        Callers hold one semaphore slot per executor worker, so the call
+        starts as soon as it is submitted and the timeout covers only the
+        lookup itself. A timed-out call keeps its slot until its thread is
+        free again, so later calls never queue behind it.
+        """
+        future = asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            await asyncio.wait([future])
+            raise
+
+    async def _forward_async(self, hostname: str, sem: asyncio.Semaphore,
+                             executor: ThreadPoolExecutor) -> Dict:
+        """Asyncio variant of _forward(); same getaddrinfo() lookup, result shape and caching."""
+        cache_key = f"forward:{hostname}"
+        if cache_key in self._cache:
+            self._stats['cached'] += 1
+            return self._cache[cache_key].copy()
+
+        async with sem:
+            try:
+                infos = await self._run_blocking(executor, socket.getaddrinfo, hostname, None)
+                ips = sorted({item[4][0] for item in infos})
+                result = {'hostname': hostname, 'ips': ips, 'error': None}
+                return self._store(cache_key, result, 'forward')
+            except (asyncio.TimeoutError, socket.timeout):
+                error = 'timeout'
+            except socket.gaierror as e:
+                error = f'gaierror: {str(e)}'
+            except Exception as e:
+                error = f'error: {str(e)}'
+        return self._store(cache_key, {'hostname': hostname, 'ips': [], 'error': error}, 'errors')
+
+    async def _reverse_async(self, ip: str, sem: asyncio.Semaphore, resolver,
+                             executor: ThreadPoolExecutor) -> Dict:
+        """
+        Asyncio variant of _reverse(); same result shape.
+        
+        With dnspython installed the PTR record is queried directly, which
+        skips /etc/hosts unlike gethostbyaddr(), so those results are cached
+        under their own key and never mixed with _reverse() ones.
+        """
+        cache_key = f"reverse:{ip}" if resolver is None else f"reverse-ptr:{ip}"
+        if cache_key in self._cache:
+            self._stats['cached'] += 1
+            return self._cache[cache_key].copy()
+
+        async with sem:
+            try:
+                if resolver is not None:
+                    answer = await resolver.resolve_address(ip)
+                    name = str(answer[0].target).rstrip('.')
+                else:
+                    name = (await self._run_blocking(executor, socket.gethostbyaddr, ip))[0]
+                result = {'ip': ip, 'hostname': name, 'error': None}
+                return self._store(cache_key, result, 'reverse')
+            except (asyncio.TimeoutError, socket.timeout):
+                error = 'timeout'
+            except socket.herror:
+                error = 'not_found'
+            except Exception as e:
+                if _dns_async is not None and isinstance(e, _dns_exc.Timeout):
+                    error = 'timeout'
+                elif _dns_async is not None and isinstance(e, (_dns_resolver.NXDOMAIN, _dns_resolver.NoAnswer)):
+                    error = 'not_found'
+                else:
+                    error = f'error: {str(e)}'
+        return self._store(cache_key, {'ip': ip, 'hostname': None, 'error': error}, 'errors')
+
+    async def forward_lookup_batch_async(self, hostnames: List[str],
+                                         concurrency: int = 1000) -> Dict[str, Dict]:
+        """
+        Perform batch forward DNS lookups on one asyncio event loop.
+        
+        Lookups use getaddrinfo(), like forward_lookup_batch(), on a
+        dedicated pool of up to `concurrency` threads; at most that many
+        are in flight at once.
+        
+        Args:
+            hostnames: List of hostnames to resolve
+            concurrency: Maximum number of simultaneous queries (default: 1000)
+            
+        Returns:
+            Dictionary mapping hostname to result dict with ips and error
+        """
+        workers = max(1, min(int(concurrency), len(hostnames)))
+        sem = asyncio.Semaphore(workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = await asyncio.gather(
+                *(self._forward_async(h, sem, executor) for h in hostnames))
+        return {r['hostname']: r for r in results}
+
+    async def reverse_lookup_batch_async(self, ips: List[str],
+                                         concurrency: int = 1000) -> Dict[str, Dict]:
+        """
+        Perform batch reverse DNS lookups on one asyncio event loop.
+        
+        Uses dnspython's asyncio resolver when it is installed, otherwise
+        gethostbyaddr() on a dedicated pool of up to `concurrency` threads.
+        
+        Args:
+            ips: List of IP addresses to resolve
+            concurrency: Maximum number of simultaneous queries (default: 1000)
+            
+        Returns:
+            Dictionary mapping IP to result dict with hostname and error
+        """
+        resolver = self._async_resolver()
+        workers = max(1, min(int(concurrency), len(ips)))
+        sem = asyncio.Semaphore(workers)
+        # The pool only starts threads on demand, so it stays empty with dnspython
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = await asyncio.gather(
+                *(self._reverse_async(ip, sem, resolver, executor) for ip in ips))
+        return {r['ip']: r for r in results}
+
     def batch_from_file(self, filepath: str, reverse: bool = False) -> Dict:
         """
         Load batch from file and process DNS lookups.
@@ -230,46 +374,60 @@ class DNSBulkProcessor:
         Returns:
             Formatted string representation of results
         """
+        return '\n'.join(self.iter_export_results(results, format))
+
+    def iter_export_results(self, results: Dict, format: str = 'csv') -> Iterator[str]:
+        """
+        Yield an export of DNS lookup results line by line.
+        
+        Lines carry no trailing newline; joining them with '\n' gives
+        export_results(). Lets large exports be written out without
+        building the whole text in memory.
+        
+        Args:
+            results: Results dictionary from lookup operations
+            format: Export format ('csv', 'json', or 'txt')
+            
+        Yields:
+            Output lines
+        """
         if format == 'csv':
-            lines = ['Source,Target,Error']
+            yield 'Source,Target,Error'
             for key, val in results.items():
                 if 'hostname' in val:  # Forward lookup
                     hostname = val.get('hostname', '')
                     ips = ';'.join(val.get('ips', []))
                     error = val.get('error') or ''
-                    lines.append(f'"{hostname}","{ips}","{error}"')
+                    yield f'"{hostname}","{ips}","{error}"'
                 else:  # Reverse lookup
                     ip = val.get('ip', '')
                     hostname = val.get('hostname') or ''
                     error = val.get('error') or ''
-                    lines.append(f'"{ip}","{hostname}","{error}"')
-            return '\n'.join(lines)
+                    yield f'"{ip}","{hostname}","{error}"'
         
         elif format == 'json':
             import json
-            return json.dumps(results, indent=2, default=str)
+            yield json.dumps(results, indent=2, default=str)
         
         elif format == 'txt':
-            lines = []
             for key, val in results.items():
                 if 'hostname' in val:  # Forward lookup
                     hostname = val.get('hostname', 'Unknown')
                     ips = ', '.join(val.get('ips', []))
                     error = val.get('error')
-                    lines.append(f"Forward Lookup: {hostname}")
-                    lines.append(f"  IPs: {ips}")
+                    yield f"Forward Lookup: {hostname}"
+                    yield f"  IPs: {ips}"
                     if error:
-                        lines.append(f"  Error: {error}")
+                        yield f"  Error: {error}"
                 else:  # Reverse lookup
                     ip = val.get('ip', 'Unknown')
                     hostname = val.get('hostname') or 'Not Found'
                     error = val.get('error')
-                    lines.append(f"Reverse Lookup: {ip}")
-                    lines.append(f"  Hostname: {hostname}")
+                    yield f"Reverse Lookup: {ip}"
+                    yield f"  Hostname: {hostname}"
                     if error:
-                        lines.append(f"  Error: {error}")
-                lines.append('')
-            return '\n'.join(lines)
+                        yield f"  Error: {error}"
+                yield ''
         
         else:
             raise ValueError(f'Unsupported export format: {format}')
@@ -308,6 +466,11 @@ class DNSBulkProcessor:
         # maintain legacy key names
         return {'host': host, 'addresses': res.get('ips') if res else [], 'error': res.get('error') if res else None}
 
+    def resolve_many(self, hosts: List[str], concurrency: int = 256) -> List[Dict]:
+        """Resolve many hosts concurrently; results follow resolve() and keep input order."""
+        found = asyncio.run(self.forward_lookup_batch_async(hosts, concurrency))
+        return [{'host': h, 'addresses': found[h]['ips'], 'error': found[h]['error']} for h in hosts]
+
     def reverse(self, ip: str) -> Dict:
         res = self._reverse(ip)
         return {'ip': ip, 'name': res.get('hostname') if res else None, 'error': res.get('error') if res else None}
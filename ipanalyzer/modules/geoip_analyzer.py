@@ -11,6 +11,8 @@ from pathlib import Path
 import csv
 import math
 
+from ._lrucache import LRUCache
+
 
 def _ip_to_int(ip: str) -> int:
     return int(ipaddress.ip_address(ip))
@@ -85,11 +87,12 @@ class GeoIPAnalyzer:
         else:
             self.db = list(self._SAMPLE_DB)
 
-        self._cache: Dict[str, Dict] = {}
+        self._cache: Dict[str, Dict] = LRUCache()
 
     def _find(self, ip: str) -> Dict:
-        if ip in self._cache:
-            return self._cache[ip].copy()
+        cached = self._cache.get(ip)
+        if cached is not None:
+            return cached.copy()
         try:
             ipa = ipaddress.ip_address(ip)
             ip_int = int(ipa)
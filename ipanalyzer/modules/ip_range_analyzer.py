@@ -34,10 +34,17 @@ IP Range Analyzer Module
 Analyze IP ranges, CIDR notation, and subnets
 """
 
-from typing import List, Dict, Tuple
+from functools import lru_cache
+from typing import List, Dict, Sequence, Tuple
 from .ip_utils import CIDRCalculator, IPConverter, IPValidator
 
 
+@lru_cache(maxsize=4096)
+def _cidr_to_range(cidr: str) -> Tuple[int, int]:
+    """Cached (network, broadcast) integers of a CIDR block"""
+    return CIDRCalculator.get_ip_range(cidr)
+
+
 class IPRangeAnalyzer:
     """Analyze IP ranges and subnets"""
     
@@ -50,8 +57,12 @@ class IPRangeAnalyzer:
         if not IPValidator.is_valid_cidr(cidr):
             raise ValueError(f"Invalid CIDR: {cidr}")
         
-        network_ip, broadcast_ip, netmask, prefix = CIDRCalculator.parse_cidr(cidr)
-        start_int, end_int = CIDRCalculator.get_ip_range(cidr)
+        # One integer parse; every string field is formatted from it
+        start_int, end_int, mask_int, prefix = CIDRCalculator._parse_cidr_ints(cidr)
+        int_to_ip = IPConverter.int_to_ip
+        network_ip = int_to_ip(start_int)
+        broadcast_ip = int_to_ip(end_int)
+        netmask = int_to_ip(mask_int)
         
         total_hosts = end_int - start_int + 1
         usable_hosts = max(0, total_hosts - 2)  # Exclude network and broadcast
@@ -65,8 +76,8 @@ class IPRangeAnalyzer:
             'total_addresses': total_hosts,
             'usable_hosts': usable_hosts,
             'ip_class': self.get_ip_class(network_ip),
-            'first_usable': IPConverter.int_to_ip(start_int + 1) if usable_hosts > 0 else network_ip,
-            'last_usable': IPConverter.int_to_ip(end_int - 1) if usable_hosts > 0 else broadcast_ip,
+            'first_usable': int_to_ip(start_int + 1) if usable_hosts > 0 else network_ip,
+            'last_usable': int_to_ip(end_int - 1) if usable_hosts > 0 else broadcast_ip,
         }
     
     def get_ip_class(self, ip: str) -> str:
@@ -149,16 +160,14 @@ class IPRangeAnalyzer:
         except:
             return cidr_list
     
-    def subnet_division(self, cidr: str, new_prefix: int) -> List[str]:
-        """Divide CIDR into smaller subnets"""
+    def subnet_division(self, cidr: str, new_prefix: int) -> Sequence[str]:
+        """
+        Divide CIDR into smaller subnets
+        The result is a lazy sequence; call list() on it before serializing
+        """
         if not IPValidator.is_valid_cidr(cidr):
             raise ValueError(f"Invalid CIDR: {cidr}")
         
-        _, _, _, original_prefix = CIDRCalculator.parse_cidr(cidr)
-        
-        if new_prefix <= original_prefix:
-            return [cidr]
-        
         return CIDRCalculator.subnets_from_cidr(cidr, new_prefix)
     
     def ip_in_range(self, ip: str, cidr: str) -> bool:
@@ -169,19 +178,44 @@ class IPRangeAnalyzer:
             raise ValueError(f"Invalid CIDR: {cidr}")
         
         ip_int = IPConverter.ip_to_int(ip)
-        start_int, end_int = CIDRCalculator.get_ip_range(cidr)
+        start_int, end_int = _cidr_to_range(cidr)
         
         return start_int <= ip_int <= end_int
     
     def find_overlaps(self, cidr1: str, cidr2: str) -> bool:
         """Check if two CIDR blocks overlap"""
-        start1, end1 = CIDRCalculator.get_ip_range(cidr1)
-        start2, end2 = CIDRCalculator.get_ip_range(cidr2)
+        start1, end1 = _cidr_to_range(cidr1)
+        start2, end2 = _cidr_to_range(cidr2)
+        return start1 <= end2 and start2 <= end1
+    
+    def ips_in_ranges(self, ips: List[str], cidrs: List[str]) -> List[List[bool]]:
+        """
+        Membership matrix: result[i][j] is True when ips[i] is in cidrs[j]
+        Every IP and CIDR is parsed once, not once per pair
+        """
+        for ip in ips:
+            if not IPValidator.is_valid_ipv4(ip):
+                raise ValueError(f"Invalid IP: {ip}")
+        for cidr in cidrs:
+            if not IPValidator.is_valid_cidr(cidr):
+                raise ValueError(f"Invalid CIDR: {cidr}")
         
-        return not (end1 < start2 or end2 < start1)
+        ranges = [_cidr_to_range(cidr) for cidr in cidrs]
+        return [[start <= ip_int <= end for start, end in ranges]
+                for ip_int in map(IPConverter.ip_to_int, ips)]
+    
+    def find_overlaps_many(self, cidrs_a: List[str], cidrs_b: List[str]) -> List[List[bool]]:
+        """
+        Overlap matrix: result[i][j] is True when cidrs_a[i] and cidrs_b[j] overlap
+        Every CIDR is parsed once, not once per pair
+        """
+        ranges_b = [_cidr_to_range(cidr) for cidr in cidrs_b]
+        return [[start_a <= end_b and start_b <= end_a for start_b, end_b in ranges_b]
+                for start_a, end_a in map(_cidr_to_range, cidrs_a)]
     
     def generate_ip_list(self, cidr: str, limit: int = 1000) -> List[str]:
         """Generate list of IPs in CIDR (with limit)"""
+        # get_usable_ips() is lazy: slicing builds only the first `limit` strings
         ips = CIDRCalculator.get_usable_ips(cidr)
         return ips[:limit]
     
@@ -206,9 +240,12 @@ class IPRangeAnalyzer:
     def _check_all_overlaps(self, cidrs: List[str]) -> List[Dict]:
         """Find all overlaps between CIDR blocks"""
         overlaps = []
+        ranges = [_cidr_to_range(cidr) for cidr in cidrs]
         for i in range(len(cidrs)):
+            start1, end1 = ranges[i]
             for j in range(i + 1, len(cidrs)):
-                if self.find_overlaps(cidrs[i], cidrs[j]):
+                start2, end2 = ranges[j]
+                if start1 <= end2 and start2 <= end1:
                     overlaps.append({
                         'cidr1': cidrs[i],
                         'cidr2': cidrs[j]
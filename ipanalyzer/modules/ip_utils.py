@@ -53,7 +53,16 @@ import re
 import socket
 import struct
 import ipaddress
-from typing import Tuple, List, Dict, Optional
+from bisect import bisect_right
+from collections.abc import Sequence
+from typing import Iterable, Iterator, Tuple, List, Dict, Optional
+
+_PACK_U32 = struct.Struct('>I').pack
+
+_IPV4_RE = re.compile(r'^(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})$')
+_CIDR_RE = re.compile(r'^(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})/(\d{1,2})$')
+_inet_pton = socket.inet_pton
+_AF_INET = socket.AF_INET
 
 
 class IPValidator:
@@ -62,8 +71,15 @@ class IPValidator:
     @staticmethod
     def is_valid_ipv4(ip: str) -> bool:
         """Check if string is valid IPv4 address"""
-        pattern = r'^(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})$'
-        match = re.match(pattern, ip)
+        # Canonical dotted quads are settled by libc; forms it rejects but
+        # the pattern allows (e.g. leading zeros) fall through to the regex
+        try:
+            _inet_pton(_AF_INET, ip)
+            return True
+        except (OSError, ValueError):
+            # ValueError: embedded NUL byte
+            pass
+        match = _IPV4_RE.match(ip)
         if not match:
             return False
         for octet in match.groups():
@@ -74,19 +90,27 @@ class IPValidator:
     @staticmethod
     def is_valid_cidr(cidr: str) -> bool:
         """Check if string is valid CIDR notation"""
-        pattern = r'^(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})/(\d{1,2})$'
-        match = re.match(pattern, cidr)
+        match = _CIDR_RE.match(cidr)
         if not match:
             return False
-        ip_parts = match.groups()[:4]
-        prefix = int(match.groups()[4])
-        
-        for octet in ip_parts:
-            if int(octet) > 255:
-                return False
-        if prefix < 0 or prefix > 32:
-            return False
-        return True
+        a, b, c, d, prefix = match.groups()
+        return (int(a) <= 255 and int(b) <= 255 and int(c) <= 255 and int(d) <= 255
+                and int(prefix) <= 32)
+    
+    @staticmethod
+    def is_valid_cidr_batch(cidrs: Iterable[str]) -> List[bool]:
+        """Check many strings for valid CIDR notation; same rules as is_valid_cidr()"""
+        match = _CIDR_RE.match
+        out = []
+        for cidr in cidrs:
+            m = match(cidr)
+            if m is None:
+                out.append(False)
+                continue
+            a, b, c, d, prefix = m.groups()
+            out.append(int(a) <= 255 and int(b) <= 255 and int(c) <= 255 and int(d) <= 255
+                       and int(prefix) <= 32)
+        return out
 
 
 class IPConverter:
@@ -96,76 +120,183 @@ class IPConverter:
     def ip_to_int(ip: str) -> int:
         """Convert IP address to integer"""
         try:
-            return struct.unpack('>I', socket.inet_aton(ip))[0]
+            return int.from_bytes(socket.inet_aton(ip), 'big')
         except (socket.error, TypeError):
             raise ValueError(f"Invalid IP address: {ip}")
     
     @staticmethod
     def int_to_ip(num: int) -> str:
         """Convert integer to IP address"""
-        return socket.inet_ntoa(struct.pack('>I', num))
+        return socket.inet_ntoa(_PACK_U32(num))
+    
+    @staticmethod
+    def ints_to_ips(nums: Iterable[int]) -> List[str]:
+        """Convert many integers to IP addresses (pack and format run in C via map)"""
+        return list(map(socket.inet_ntoa, map(_PACK_U32, nums)))
+
+
+class UsableIPRange(Sequence):
+    """
+    Read-only sequence of IPv4 address strings over a range of integers
+    Holds only the integer range; indexing formats one address, slicing
+    returns a list, and len() / `in` are O(1)
+    """
+    
+    __slots__ = ('_ints',)
+    
+    def __init__(self, ints: range):
+        self._ints = ints
+    
+    def __len__(self) -> int:
+        return len(self._ints)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return IPConverter.ints_to_ips(self._ints[index])
+        return IPConverter.int_to_ip(self._ints[index])
+    
+    def __iter__(self) -> Iterator[str]:
+        return map(socket.inet_ntoa, map(_PACK_U32, self._ints))
+    
+    def __contains__(self, ip) -> bool:
+        try:
+            return IPConverter.ip_to_int(ip) in self._ints
+        except ValueError:
+            return False
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, UsableIPRange):
+            return self._ints == other._ints
+        if isinstance(other, (list, tuple)):
+            return len(other) == len(self) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        if not self._ints:
+            return 'UsableIPRange([])'
+        return f"UsableIPRange({self[0]!r}..{self[-1]!r}, {len(self)} addresses)"
+
+
+class SubnetRange(UsableIPRange):
+    """
+    Read-only sequence of equal-size CIDR strings ("a.b.c.d/prefix")
+    Holds a stepped range of network integers and formats blocks on access
+    """
+    
+    __slots__ = ('_suffix',)
+    
+    def __init__(self, ints: range, prefix: int):
+        super().__init__(ints)
+        self._suffix = f"/{prefix}"
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ip + self._suffix for ip in IPConverter.ints_to_ips(self._ints[index])]
+        return IPConverter.int_to_ip(self._ints[index]) + self._suffix
+    
+    def __iter__(self) -> Iterator[str]:
+        suffix = self._suffix
+        return (ip + suffix for ip in map(socket.inet_ntoa, map(_PACK_U32, self._ints)))
+    
+    def __contains__(self, cidr) -> bool:
+        if not isinstance(cidr, str):
+            return False
+        ip, sep, prefix = cidr.partition('/')
+        return sep + prefix == self._suffix and super().__contains__(ip)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, SubnetRange):
+            return self._ints == other._ints and self._suffix == other._suffix
+        if isinstance(other, UsableIPRange):
+            return False
+        return super().__eq__(other)
+    
+    def __repr__(self) -> str:
+        if not self._ints:
+            return 'SubnetRange([])'
+        return f"SubnetRange({self[0]!r}..{self[-1]!r}, {len(self)} subnets)"
 
 
 class CIDRCalculator:
     """Calculate CIDR ranges and subnet information"""
     
     @staticmethod
-    def parse_cidr(cidr: str) -> Tuple[str, str, str, int]:
+    def _parse_cidr_ints(cidr: str) -> Tuple[int, int, int, int]:
         """
-        Parse CIDR notation
-        Returns: (network_ip, broadcast_ip, netmask, prefix_length)
+        Parse CIDR notation into integers
+        Returns: (network_int, broadcast_int, mask_int, prefix_length)
         """
         ip, prefix = cidr.split('/')
         prefix = int(prefix)
-        
-        # Calculate netmask
         mask_bits = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
-        netmask = IPConverter.int_to_ip(mask_bits)
-        
-        # Calculate network IP
-        ip_int = IPConverter.ip_to_int(ip)
-        network_int = ip_int & mask_bits
-        network_ip = IPConverter.int_to_ip(network_int)
-        
-        # Calculate broadcast IP
-        broadcast_int = network_int | (~mask_bits & 0xFFFFFFFF)
-        broadcast_ip = IPConverter.int_to_ip(broadcast_int)
-        
-        return network_ip, broadcast_ip, netmask, prefix
+        network_int = IPConverter.ip_to_int(ip) & mask_bits
+        broadcast_int = network_int | (mask_bits ^ 0xFFFFFFFF)
+        return network_int, broadcast_int, mask_bits, prefix
+    
+    @staticmethod
+    def parse_cidr(cidr: str) -> Tuple[str, str, str, int]:
+        """
+        Parse CIDR notation
+        Returns: (network_ip, broadcast_ip, netmask, prefix_length)
+        """
+        network_int, broadcast_int, mask_bits, prefix = CIDRCalculator._parse_cidr_ints(cidr)
+        int_to_ip = IPConverter.int_to_ip
+        return int_to_ip(network_int), int_to_ip(broadcast_int), int_to_ip(mask_bits), prefix
     
     @staticmethod
     def get_ip_range(cidr: str) -> Tuple[int, int]:
         """Get range of usable IPs in CIDR block"""
-        network_ip, broadcast_ip, _, _ = CIDRCalculator.parse_cidr(cidr)
-        return IPConverter.ip_to_int(network_ip), IPConverter.ip_to_int(broadcast_ip)
+        network_int, broadcast_int, _, _ = CIDRCalculator._parse_cidr_ints(cidr)
+        return network_int, broadcast_int
     
     @staticmethod
-    def get_usable_ips(cidr: str) -> List[str]:
-        """Get all usable IPs in CIDR block (excluding network and broadcast)"""
+    def get_usable_ips(cidr: str) -> 'UsableIPRange':
+        """
+        Get all usable IPs in CIDR block (excluding network and broadcast)
+        Returns a lazy sequence; address strings are built only when read
+        """
         start_int, end_int = CIDRCalculator.get_ip_range(cidr)
         # Exclude network address and broadcast address
         if end_int - start_int > 2:
-            return [IPConverter.int_to_ip(i) for i in range(start_int + 1, end_int)]
-        return []
+            return UsableIPRange(range(start_int + 1, end_int))
+        return UsableIPRange(range(0))
     
     @staticmethod
-    def subnets_from_cidr(cidr: str, subnet_prefix: int) -> List[str]:
-        """Divide CIDR block into smaller subnets"""
-        network_ip, _, _, original_prefix = CIDRCalculator.parse_cidr(cidr)
+    def subnets_from_cidr(cidr: str, subnet_prefix: int) -> 'Sequence[str]':
+        """
+        Divide CIDR block into smaller subnets
+        Returns a lazy SubnetRange, so a /8 cut into /32s costs nothing
+        until the subnets are read; call list() on it before serializing
+        (e.g. json.dumps). A prefix no longer than the block's yields the
+        block itself as the only element
+        """
+        ip_int, _, _, original_prefix = CIDRCalculator._parse_cidr_ints(cidr)
         
         if subnet_prefix <= original_prefix:
-            return [cidr]
+            # Unmasked address, so the element reads back exactly as given
+            host_int = IPConverter.ip_to_int(cidr.split('/')[0])
+            return SubnetRange(range(host_int, host_int + 1), original_prefix)
         
-        subnets = []
-        ip_int = IPConverter.ip_to_int(network_ip)
-        num_subnets = 2 ** (subnet_prefix - original_prefix)
-        step = 2 ** (32 - subnet_prefix)
-        
-        for i in range(num_subnets):
-            subnet_ip = IPConverter.int_to_ip(ip_int + i * step)
-            subnets.append(f"{subnet_ip}/{subnet_prefix}")
-        
-        return subnets
+        num_subnets = 1 << (subnet_prefix - original_prefix)
+        step = 1 << (32 - subnet_prefix)
+        return SubnetRange(range(ip_int, ip_int + num_subnets * step, step), subnet_prefix)
+
+
+# Special-purpose IPv4 blocks as disjoint (first, last, label) rows sorted by
+# first address, so classify() is one bisect instead of a chain of checks
+_CLASS_TABLE = sorted(
+    (IPConverter.ip_to_int(first), IPConverter.ip_to_int(last), label)
+    for first, last, label in (
+        ("10.0.0.0", "10.255.255.255", "Private"),
+        ("127.0.0.0", "127.255.255.255", "Loopback"),
+        ("169.254.0.0", "169.254.255.255", "Link-Local"),
+        ("172.16.0.0", "172.31.255.255", "Private"),
+        ("192.168.0.0", "192.168.255.255", "Private"),
+    )
+)
+_CLASS_FIRSTS = tuple(row[0] for row in _CLASS_TABLE)
+_CLASS_LASTS = tuple(row[1] for row in _CLASS_TABLE)
+_CLASS_LABELS = tuple(row[2] for row in _CLASS_TABLE)
 
 
 class IPClassifier:
@@ -201,14 +332,21 @@ class IPClassifier:
     @staticmethod
     def classify(ip: str) -> str:
         """Classify IP address"""
-        if IPClassifier.is_loopback(ip):
-            return "Loopback"
-        elif IPClassifier.is_link_local(ip):
-            return "Link-Local"
-        elif IPClassifier.is_private(ip):
-            return "Private"
-        else:
-            return "Public"
+        ip_int = IPConverter.ip_to_int(ip)
+        i = bisect_right(_CLASS_FIRSTS, ip_int) - 1
+        if i >= 0 and ip_int <= _CLASS_LASTS[i]:
+            return _CLASS_LABELS[i]
+        return "Public"
+    
+    @staticmethod
+    def classify_batch(ips: Iterable[str]) -> List[str]:
+        """Classify many IP addresses; same labels as classify()"""
+        firsts, lasts, labels = _CLASS_FIRSTS, _CLASS_LASTS, _CLASS_LABELS
+        out = []
+        for ip_int in map(IPConverter.ip_to_int, ips):
+            i = bisect_right(firsts, ip_int) - 1
+            out.append(labels[i] if i >= 0 and ip_int <= lasts[i] else "Public")
+        return out
 
 
 class IPv6Utils:
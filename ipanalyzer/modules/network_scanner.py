@@ -29,10 +29,100 @@ import re
 import platform
 import socket
 import struct
+import os
+import select
+import time
+from itertools import count
 from typing import List, Dict, Optional
 from threading import Thread, Lock
 import queue
 
+# Service names reported for well-known ports
+_PORT_TO_SERVICE = {
+    22: 'SSH',
+    80: 'HTTP',
+    443: 'HTTPS',
+    3389: 'RDP',
+    5900: 'VNC',
+    8080: 'HTTP-Proxy',
+    8443: 'HTTPS-Alt',
+    25: 'SMTP',
+    53: 'DNS',
+    110: 'POP3',
+    143: 'IMAP',
+    3306: 'MySQL',
+    5432: 'PostgreSQL',
+    6379: 'Redis',
+    27017: 'MongoDB',
+}
+
+_ICMP_ECHO_REPLY = 0
+_ICMP_ECHO_REQUEST = 8
+_ICMP_HEADER = struct.Struct('!BBHHH')  # type, code, checksum, id, sequence
+_ICMP_PAYLOAD = b'ipanalyzer-ping'
+_icmp_seq = count(1)
+
+
+def _icmp_checksum(data: bytes) -> int:
+    """RFC 1071 ones' complement checksum"""
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _icmp_echo(ip: str, timeout: float) -> Optional[bool]:
+    """
+    Send one ICMP echo request from this process and wait for the reply
+    Uses an unprivileged ICMP datagram socket where the OS allows it, else
+    a raw socket; returns None when neither may be opened (or sending
+    fails) so the caller can fall back to the ping command
+    """
+    sock = raw = None
+    for sock_type in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+        try:
+            sock = socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP)
+            raw = sock_type == socket.SOCK_RAW
+            break
+        except OSError:
+            continue
+    if sock is None:
+        return None
+    
+    ident = os.getpid() & 0xFFFF
+    seq = next(_icmp_seq) & 0xFFFF
+    header = _ICMP_HEADER.pack(_ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    checksum = _icmp_checksum(header + _ICMP_PAYLOAD)
+    packet = _ICMP_HEADER.pack(_ICMP_ECHO_REQUEST, 0, checksum, ident, seq) + _ICMP_PAYLOAD
+    
+    with sock:
+        try:
+            dest = socket.gethostbyname(ip)
+            sock.sendto(packet, (dest, 0))
+        except OSError:
+            return None
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([sock], [], [], remaining)[0]:
+                return False
+            try:
+                data, addr = sock.recvfrom(1024)
+            except OSError:
+                return False
+            # Raw sockets, and datagram ones on macOS/BSD, deliver the IPv4
+            # header too; an ICMP reply never starts with a 4 nibble
+            if data and data[0] >> 4 == 4:
+                data = data[(data[0] & 0x0F) * 4:]
+            if addr[0] != dest or len(data) < _ICMP_HEADER.size:
+                continue
+            rtype, _, _, rid, rseq = _ICMP_HEADER.unpack_from(data)
+            # Datagram ICMP sockets rewrite the id, so it is only checked on raw ones
+            if rtype == _ICMP_ECHO_REPLY and rseq == seq and (not raw or rid == ident):
+                return True
+
 
 class NetworkScanner:
     """Scan network for connected devices"""
@@ -76,6 +166,10 @@ class NetworkScanner:
     
     def ping_host(self, ip: str, timeout: int = 1) -> bool:
         """Check if host is reachable via ping"""
+        # In-process ICMP echo first; the ping command only when ICMP sockets are not permitted
+        reachable = _icmp_echo(ip, timeout)
+        if reachable is not None:
+            return reachable
         try:
             if self.os_type == 'Windows':
                 result = subprocess.run(
@@ -233,24 +327,7 @@ class NetworkScanner:
     @staticmethod
     def get_service_name(port: int) -> str:
         """Get common service name for port"""
-        services = {
-            22: 'SSH',
-            80: 'HTTP',
-            443: 'HTTPS',
-            3389: 'RDP',
-            5900: 'VNC',
-            8080: 'HTTP-Proxy',
-            8443: 'HTTPS-Alt',
-            25: 'SMTP',
-            53: 'DNS',
-            110: 'POP3',
-            143: 'IMAP',
-            3306: 'MySQL',
-            5432: 'PostgreSQL',
-            6379: 'Redis',
-            27017: 'MongoDB',
-        }
-        return services.get(port, 'Unknown')
+        return _PORT_TO_SERVICE.get(port, 'Unknown')
     
     def get_network_info(self) -> Dict:
         """Get current network information"""
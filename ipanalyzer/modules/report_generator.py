@@ -1,21 +1,3 @@
-"""Simple HTML report generator."""
-from typing import Any, Dict
-
-
-class ReportGenerator:
-    def generate_html(self, data: Dict[str, Any]) -> str:
-        parts = ["<html><head><meta charset='utf-8'><title>IPAnalyzer Report</title></head><body>"]
-        parts.append("<h1>IPAnalyzer Report</h1>")
-        parts.append("<pre>")
-        import json
-        parts.append(json.dumps(data, indent=2))
-        parts.append("</pre>")
-        parts.append("</body></html>")
-        return '\n'.join(parts)
-
-    def save(self, html: str, path: str):
-        with open(path, 'w', encoding='utf-8') as fh:
-            fh.write(html)
 """
 Report Generator Module
 Generate professional HTML reports for IP analysis
@@ -26,6 +8,11 @@ from typing import Dict, List, Optional
 import json
 
 
+# Badge CSS class per device status; anything else renders as inactive
+_STATUS_CLASS = {'active': 'status-active'}
+_STATUS_DEFAULT = 'status-inactive'
+
+
 class ReportGenerator:
     """Generate HTML reports for IP analysis"""
     
@@ -67,6 +54,14 @@ class ReportGenerator:
                 f.write(html)
         
         return html
+
+    # Compatibility alias for callers of the former minimal generator
+    generate_html = generate_html_report
+
+    def save(self, html: str, path: str) -> None:
+        """Write rendered HTML to a file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
     
     def _get_html_header(self) -> str:
         """Get HTML document header"""
@@ -343,15 +338,16 @@ class ReportGenerator:
     def _get_header_section(self) -> str:
         """Get header section HTML"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        tool, version, author = self.tool_name, self.version, self.author
         return f"""
 <div class="container">
     <div class="header">
-        <h1>🔍 {self.tool_name}</h1>
+        <h1>🔍 {tool}</h1>
         <p>Advanced IP Analysis Report</p>
         <div class="meta-info">
             <div class="meta-item"><strong>Generated:</strong> {timestamp}</div>
-            <div class="meta-item"><strong>Tool:</strong> {self.tool_name} v{self.version}</div>
-            <div class="meta-item"><strong>Author:</strong> {self.author}</div>
+            <div class="meta-item"><strong>Tool:</strong> {tool} v{version}</div>
+            <div class="meta-item"><strong>Author:</strong> {author}</div>
         </div>
     </div>
 """
@@ -457,7 +453,9 @@ class ReportGenerator:
                 status = device.get('status', 'unknown')
                 method = device.get('method', 'N/A')
                 
-                status_class = 'status-active' if status == 'active' else 'status-inactive'
+                status_class = _STATUS_CLASS.get(status, _STATUS_DEFAULT)
+                status_up = status.upper()
+                method_up = method.upper()
                 
                 section += f"""
                     <tr>
@@ -465,8 +463,8 @@ class ReportGenerator:
                         <td><code>{mac}</code></td>
                         <td>{hostname}</td>
                         <td><span class="badge">{vendor}</span></td>
-                        <td><span class="status-badge {status_class}">{status.upper()}</span></td>
-                        <td>{method.upper()}</td>
+                        <td><span class="status-badge {status_class}">{status_up}</span></td>
+                        <td>{method_up}</td>
                     </tr>
 """
             
@@ -571,10 +569,11 @@ class ReportGenerator:
     
     def _get_footer_section(self) -> str:
         """Get footer section HTML"""
+        tool, version, author = self.tool_name, self.version, self.author
         return f"""
     <div class="footer">
-        <p><strong>{self.tool_name}</strong> v{self.version}</p>
-        <p>Created by <strong>{self.author}</strong></p>
+        <p><strong>{tool}</strong> v{version}</p>
+        <p>Created by <strong>{author}</strong></p>
         <p>© 2026 - Advanced IP Analysis Tool</p>
     </div>
 </div>
@@ -1,39 +1,117 @@
-"""Simple threat intelligence module using local blacklists."""
-from pathlib import Path
-
-
-class ThreatIntel:
-    DEFAULT_BLACKLIST = Path(__file__).resolve().parents[1] / "data" / "blacklist.txt"
-
-    def __init__(self, blacklist_path: str = None):
-        self.blacklist = Path(blacklist_path) if blacklist_path else self.DEFAULT_BLACKLIST
-        self._load()
-
-    def _load(self):
-        self._bl = set()
-        try:
-            with open(self.blacklist, 'r', encoding='utf-8') as fh:
-                for line in fh:
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    self._bl.add(line)
-        except Exception:
-            self._bl = set()
-
-    def is_blacklisted(self, ip: str) -> bool:
-        return ip in self._bl
-
-    def info(self, ip: str) -> dict:
-        return {'ip': ip, 'blacklisted': self.is_blacklisted(ip)}
 """
 Threat Intelligence - IP reputation and threat analysis module
 Provides threat scoring, blacklist management, and threat history tracking.
 """
-from typing import List, Dict, Optional, Set, Tuple
+from typing import List, Dict, Optional, Set, TextIO, Tuple
+from collections import defaultdict
+import csv
+import io
+import mmap
 import os
+import socket
+import struct
 from datetime import datetime, timedelta, timezone
 
+from ._timeutil import utc_now_iso
+
+
+def _pack_ip(ip_address: str) -> Optional[bytes]:
+    """Pack an IPv4/IPv6 address to network-order bytes, or None if invalid."""
+    family = socket.AF_INET6 if ':' in ip_address else socket.AF_INET
+    try:
+        return socket.inet_pton(family, ip_address)
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def _read_entries(path: str) -> Set[bytes]:
+    """
+    Read a one-entry-per-line list file as a set of bytes.
+    
+    The file is memory-mapped and split in C; blank lines and '#' comments
+    are skipped. A missing or empty file yields an empty set.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return set()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                lines = mm[:].splitlines()
+    except FileNotFoundError:
+        return set()
+    return {line for line in map(bytes.strip, lines)
+            if line and not line.startswith(b'#')}
+
+
+class _TrieNode:
+    __slots__ = ('children', 'partial', 'terminal')
+
+    def __init__(self):
+        self.children: Dict[int, '_TrieNode'] = {}
+        # prefix bits within the next byte -> set of leading-bit values
+        self.partial: Dict[int, Set[int]] = {}
+        self.terminal = False
+
+
+class CIDRTrie:
+    """
+    Prefix trie for CIDR membership tests over IPv4 and IPv6.
+    
+    Whole bytes of a prefix are consumed one trie level at a time; the
+    trailing partial byte (prefix length not a multiple of 8) is stored as
+    a small set of leading-bit values on the last node, so a lookup costs
+    at most one dict probe per address byte.
+    """
+
+    def __init__(self):
+        self._roots = {4: _TrieNode(), 16: _TrieNode()}
+        self.size = 0
+
+    def insert(self, packed: bytes, prefix_len: int) -> None:
+        """Add a network given as packed address bytes and prefix length."""
+        node = self._roots[len(packed)]
+        full, rem = divmod(prefix_len, 8)
+        for byte in packed[:full]:
+            if node.terminal:
+                return  # already covered by a shorter prefix
+            node = node.children.setdefault(byte, _TrieNode())
+        if rem:
+            node.partial.setdefault(rem, set()).add(packed[full] >> (8 - rem))
+        else:
+            node.terminal = True
+        self.size += 1
+
+    def add(self, cidr: str) -> bool:
+        """Add a network in 'addr/prefix' notation. Returns False if invalid."""
+        addr, _, prefix = cidr.partition('/')
+        packed = _pack_ip(addr.strip())
+        if packed is None:
+            return False
+        try:
+            prefix_len = int(prefix)
+        except ValueError:
+            return False
+        if not 0 <= prefix_len <= len(packed) * 8:
+            return False
+        self.insert(packed, prefix_len)
+        return True
+
+    def match(self, packed: bytes) -> bool:
+        """Check whether a packed address falls inside any stored network."""
+        node = self._roots.get(len(packed))
+        if node is None:
+            return False
+        for byte in packed:
+            if node.terminal:
+                return True
+            for bits, values in node.partial.items():
+                if byte >> (8 - bits) in values:
+                    return True
+            node = node.children.get(byte)
+            if node is None:
+                return False
+        return node.terminal
+
 
 class ThreatIntelligence:
     """
@@ -81,34 +159,45 @@ class ThreatIntelligence:
         )
         self._load_blacklist()
         self._load_whitelist()
-        self._history = {}
+        self._history: Dict[str, List[Dict]] = defaultdict(list)
         self._threat_db = self._initialize_threat_db()
+        # Same records keyed on the packed 32-bit address for hot-path lookups
+        self._threat_db_int = {}
+        for ip, info in self._threat_db.items():
+            key = self._ip_key(ip)
+            if key is not None:
+                self._threat_db_int[key] = info
 
     def _load_blacklist(self) -> None:
         """Load blacklist from file."""
-        self.blacklist: Set[str] = set()
-        try:
-            with open(self.blacklist_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    self.blacklist.add(line)
-        except FileNotFoundError:
-            self.blacklist = set()
+        self.blacklist: Set[bytes] = _read_entries(self.blacklist_path)
+        self._build_blacklist_index()
+
+    def _build_blacklist_index(self) -> None:
+        """Index blacklist entries: IPv4 hosts as ints, CIDRs in a prefix trie."""
+        self._blacklist_hosts: Set[int] = set()
+        self._blacklist_trie = CIDRTrie()
+        ip_key = self._ip_key
+        for entry in self.blacklist:
+            text = entry.decode('ascii', errors='replace')
+            if b'/' in entry:
+                self._blacklist_trie.add(text)
+            else:
+                key = ip_key(text)
+                if key is not None:
+                    self._blacklist_hosts.add(key)
 
     def _load_whitelist(self) -> None:
         """Load whitelist from file."""
-        self.whitelist: Set[str] = set()
+        self.whitelist: Set[bytes] = _read_entries(self.whitelist_path)
+
+    @staticmethod
+    def _ip_key(ip_address: str) -> Optional[int]:
+        """Return the IPv4 address as a 32-bit integer, or None if not IPv4."""
         try:
-            with open(self.whitelist_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    self.whitelist.add(line)
-        except FileNotFoundError:
-            self.whitelist = set()
+            return struct.unpack('!I', socket.inet_pton(socket.AF_INET, ip_address))[0]
+        except (OSError, TypeError, ValueError):
+            return None
 
     def _initialize_threat_db(self) -> Dict[str, Dict]:
         """Initialize in-memory threat database."""
@@ -144,7 +233,7 @@ class ThreatIntelligence:
                 - details: Detailed threat information
         """
         # Check if whitelisted
-        if ip_address in self.whitelist:
+        if ip_address.encode() in self.whitelist:
             record = {
                 'ip': ip_address,
                 'threat_level': 'UNKNOWN',
@@ -152,19 +241,20 @@ class ThreatIntelligence:
                 'threat_types': [],
                 'malware': [],
                 'exploits': [],
-                'last_seen': datetime.now(timezone.utc).isoformat(),
+                'last_seen': utc_now_iso(aware=True),
                 'sources': ['whitelist'],
                 'details': 'IP is on whitelist',
                 'whitelisted': True
             }
-            self._history.setdefault(ip_address, []).append(record)
+            self._history[ip_address].append(record)
             return record
 
-        # Check if blacklisted
-        is_blacklisted = ip_address in self.blacklist
+        # Check if blacklisted (exact entry or inside a blacklisted network)
+        is_blacklisted = self.match(ip_address)
         
         # Check threat database
-        threat_info = self._threat_db.get(ip_address, {})
+        ip_key = self._ip_key(ip_address)
+        threat_info = self._threat_db_int.get(ip_key, {}) if ip_key is not None else {}
         
         # Calculate threat level and score
         threat_types = []
@@ -210,13 +300,13 @@ class ThreatIntelligence:
             'threat_types': threat_types,
             'malware': threat_info.get('malware', []) if threat_info else [],
             'exploits': threat_info.get('exploits', []) if threat_info else [],
-            'last_seen': datetime.now(timezone.utc).isoformat(),
+            'last_seen': utc_now_iso(aware=True),
             'sources': sources,
             'details': threat_info.get('details', 'No additional details') if threat_info else 'No known threats',
             'whitelisted': False
         }
         
-        self._history.setdefault(ip_address, []).append(record)
+        self._history[ip_address].append(record)
         return record
 
     def is_blacklisted(self, ip_address: str) -> bool:
@@ -229,7 +319,40 @@ class ThreatIntelligence:
         Returns:
             True if IP is blacklisted
         """
-        return ip_address in self.blacklist
+        return self.match(ip_address)
+
+    def match(self, ip_address: str) -> bool:
+        """
+        Match an IP against exact blacklist entries and blacklisted CIDRs.
+        
+        Args:
+            ip_address: IPv4 or IPv6 address
+            
+        Returns:
+            True if the IP is listed or covered by a listed network
+        """
+        key = self._ip_key(ip_address)
+        if key is not None:
+            if key in self._blacklist_hosts:
+                return True
+        elif ip_address.encode() in self.blacklist:
+            return True
+        if not self._blacklist_trie.size:
+            return False
+        packed = _pack_ip(ip_address)
+        return packed is not None and self._blacklist_trie.match(packed)
+
+    def info(self, ip_address: str) -> Dict:
+        """
+        Minimal blacklist verdict for an IP (legacy ThreatIntel API).
+        
+        Args:
+            ip_address: IP to check
+            
+        Returns:
+            Dictionary with ip and blacklisted flag
+        """
+        return {'ip': ip_address, 'blacklisted': self.is_blacklisted(ip_address)}
 
     def is_whitelisted(self, ip_address: str) -> bool:
         """
@@ -241,7 +364,7 @@ class ThreatIntelligence:
         Returns:
             True if IP is whitelisted
         """
-        return ip_address in self.whitelist
+        return ip_address.encode() in self.whitelist
 
     def get_threat_history(self, ip_address: str, days: int = 30) -> List[Dict]:
         """
@@ -270,7 +393,8 @@ class ThreatIntelligence:
         Returns:
             Dictionary mapping IP to threat analysis
         """
-        return {ip: self.analyze_threat(ip) for ip in ips}
+        analyze = self.analyze_threat
+        return {ip: analyze(ip) for ip in ips}
 
     def add_to_blacklist(self, ip_address: str) -> None:
         """
@@ -279,7 +403,14 @@ class ThreatIntelligence:
         Args:
             ip_address: IP to blacklist
         """
-        self.blacklist.add(ip_address)
+        entry = ip_address.encode()
+        self.blacklist.add(entry)
+        if b'/' in entry:
+            self._blacklist_trie.add(ip_address)
+            return
+        key = self._ip_key(ip_address)
+        if key is not None:
+            self._blacklist_hosts.add(key)
 
     def remove_from_blacklist(self, ip_address: str) -> None:
         """
@@ -288,7 +419,14 @@ class ThreatIntelligence:
         Args:
             ip_address: IP to remove
         """
-        self.blacklist.discard(ip_address)
+        entry = ip_address.encode()
+        self.blacklist.discard(entry)
+        if b'/' in entry:
+            self._build_blacklist_index()
+            return
+        key = self._ip_key(ip_address)
+        if key is not None:
+            self._blacklist_hosts.discard(key)
 
     def add_to_whitelist(self, ip_address: str) -> None:
         """
@@ -297,7 +435,7 @@ class ThreatIntelligence:
         Args:
             ip_address: IP to whitelist
         """
-        self.whitelist.add(ip_address)
+        self.whitelist.add(ip_address.encode())
 
     def remove_from_whitelist(self, ip_address: str) -> None:
         """
@@ -306,31 +444,35 @@ class ThreatIntelligence:
         Args:
             ip_address: IP to remove
         """
-        self.whitelist.discard(ip_address)
+        self.whitelist.discard(ip_address.encode())
 
-    def export_threat_report(self, ip_address: str, format: str = 'csv') -> str:
+    def export_threat_report(self, ip_address: str, format: str = 'csv',
+                             file: Optional[TextIO] = None) -> Optional[str]:
         """
         Generate threat report for an IP address.
         
         Args:
             ip_address: IP to report on
             format: Export format ('csv' or 'text')
+            file: Optional text stream CSV rows are written to directly
             
         Returns:
-            Formatted report string
+            Formatted report string, or None when written to `file`
         """
         history = self.get_threat_history(ip_address, days=90)
         
         if format == 'csv':
-            lines = ['IP,ThreatLevel,RiskScore,ThreatTypes,LastSeen']
-            for record in history:
-                threat_types = ';'.join(record.get('threat_types', []))
-                lines.append(
-                    f"{record['ip']},{record['threat_level']},"
-                    f"{record['risk_score']},\"{threat_types}\","
-                    f"{record['last_seen']}"
-                )
-            return '\n'.join(lines)
+            out = file if file is not None else io.StringIO()
+            writer = csv.writer(out, lineterminator='\n')
+            writer.writerow(['IP', 'ThreatLevel', 'RiskScore', 'ThreatTypes', 'LastSeen'])
+            writer.writerows(
+                (record['ip'], record['threat_level'], record['risk_score'],
+                 ';'.join(record.get('threat_types', [])), record['last_seen'])
+                for record in history
+            )
+            if file is not None:
+                return None
+            return out.getvalue().rstrip('\n')
         
         elif format == 'text':
             lines = [f"Threat Report for {ip_address}", "=" * 50]
@@ -361,12 +503,8 @@ class ThreatIntelligence:
         Returns:
             List of analysis results for high-risk IPs
         """
-        results = []
-        for ip in ips:
-            analysis = self.analyze_threat(ip)
-            if analysis['risk_score'] >= threshold:
-                results.append(analysis)
-        return results
+        return [analysis for analysis in map(self.analyze_threat, ips)
+                if analysis['risk_score'] >= threshold]
 
     def get_statistics(self) -> Dict:
         """
@@ -396,13 +534,18 @@ class ThreatIntelligence:
         cutoff_time = datetime.now(timezone.utc) - timedelta(days=days_old)
         removed = 0
         
-        for ip in list(self._history.keys()):
-            old_records = [r for r in self._history[ip]
-                          if datetime.fromisoformat(r['last_seen']) < cutoff_time]
-            removed += len(old_records)
-            self._history[ip] = [r for r in self._history[ip]
-                                if datetime.fromisoformat(r['last_seen']) >= cutoff_time]
-            if not self._history[ip]:
+        for ip in list(self._history):
+            records = self._history[ip]
+            keep = [r for r in records
+                    if datetime.fromisoformat(r['last_seen']) >= cutoff_time]
+            removed += len(records) - len(keep)
+            if keep:
+                self._history[ip] = keep
+            else:
                 del self._history[ip]
         
         return removed
+
+
+# Backwards-compatible name for the former blacklist-only class
+ThreatIntel = ThreatIntelligence
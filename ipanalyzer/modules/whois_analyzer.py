@@ -1,155 +1,262 @@
-"""WHOIS analyzer using WHOIS protocol (port 43) with basic referral handling."""
-import socket
-from typing import Optional
-
-
-class WHOISAnalyzer:
-    DEFAULT_PORT = 43
-
-    def _query_server(self, server: str, query: str, timeout: int = 5) -> str:
-        resp = []
-        try:
-            with socket.create_connection((server, self.DEFAULT_PORT), timeout=timeout) as s:
-                s.sendall((query + '\r\n').encode('utf-8'))
-                while True:
-                    data = s.recv(4096)
-                    if not data:
-                        break
-                    resp.append(data.decode('utf-8', errors='replace'))
-        except Exception as e:
-            return f"ERROR: {e}"
-        return ''.join(resp)
-
-    def lookup(self, ip: str) -> dict:
-        # First query IANA for referral
-        iana = self._query_server('whois.iana.org', ip)
-        # find refer or whois server in response
-        refer = None
-        for line in iana.splitlines():
-            if line.lower().startswith('refer:') or line.lower().startswith('whois:'):
-                parts = line.split(':', 1)
-                if len(parts) > 1:
-                    refer = parts[1].strip()
-                    break
-
-        if not refer:
-            # fallback to ARIN
-            refer = 'whois.arin.net'
-
-        resp = self._query_server(refer, ip)
-        return {'ip': ip, 'server': refer, 'raw': resp}
 """
 WHOIS Analyzer Module
-Offline WHOIS lookup using built-in data and socket communication
+Offline WHOIS lookup using built-in data and socket communication,
+with optional IANA referral following for live queries
 """
 
 import socket
 import re
-from typing import Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from datetime import datetime
 import json
 import os
 
+from ._lrucache import LRUCache
+from .ip_utils import IPClassifier, IPConverter
+
+
+# WHOIS server mapping for different RIRs
+WHOIS_SERVERS = {
+    'ARIN': 'whois.arin.net',  # North America
+    'RIPE': 'whois.ripe.net',  # Europe
+    'APNIC': 'whois.apnic.net',  # Asia-Pacific
+    'LACNIC': 'whois.lacnic.net',  # Latin America
+    'AFNIC': 'whois.afnic.fr',  # Africa
+}
+
+IANA_WHOIS_SERVER = 'whois.iana.org'
+
+# Built-in IP ranges database: RIR -> ((cidr, organization, country), ...)
+IP_RANGES_DB = {
+    'ARIN': (
+        ('1.0.0.0/24', 'APNIC', 'AU'),
+        ('1.1.1.0/24', 'APNIC', 'AU'),
+        ('8.0.0.0/7', 'Level 3 Communications', 'US'),
+        ('10.0.0.0/8', 'Private-Use', 'PRIVATE'),
+    ),
+    'RIPE': (
+        ('2.0.0.0/7', 'RIPE NCC', 'EU'),
+        ('5.0.0.0/8', 'RIPE NCC', 'EU'),
+    ),
+    'APNIC': (
+        ('27.0.0.0/8', 'APNIC', 'AU'),
+        ('58.0.0.0/8', 'APNIC', 'CN'),
+    ),
+}
+
+# Country codes database
+COUNTRY_DB = {
+    'US': 'United States',
+    'AU': 'Australia',
+    'CN': 'China',
+    'IN': 'India',
+    'EU': 'European Union',
+    'GB': 'United Kingdom',
+    'DE': 'Germany',
+    'FR': 'France',
+    'JP': 'Japan',
+    'BR': 'Brazil',
+    'PRIVATE': 'Private Network',
+}
+
+# "refer:" / "whois:" line of an IANA response naming the authoritative server
+_REFER_RE = re.compile(r'^(?:refer|whois):[ \t]*(\S+)', re.MULTILINE | re.IGNORECASE)
+
+# IANA referrals memoized per IPv4 /8, the granularity IANA delegates at
+_REFERRAL_CACHE: Dict[str, str] = {}
+
+# Resolved WHOIS server addresses, keyed by (host, port); WHOIS closes the
+# connection after every answer, so the DNS lookup is what can be reused
+_SERVER_ADDRS: Dict[tuple, tuple] = {}
+
+
+def _server_address(server: str, port: int) -> tuple:
+    """Return a cached (ip, port) for a WHOIS server, resolving it on first use"""
+    key = (server, port)
+    addr = _SERVER_ADDRS.get(key)
+    if addr is None:
+        addr = socket.getaddrinfo(server, port, type=socket.SOCK_STREAM)[0][4][:2]
+        _SERVER_ADDRS[key] = addr
+    return addr
+
+
+def _match_cidr(ip_int: int, nets: tuple, masks: tuple) -> int:
+    """
+    Return the index of the first network containing ip_int, or -1.
+    Pure integer loop over the compiled range tuples.
+    """
+    i = 0
+    for net, mask in zip(nets, masks):
+        if ip_int & mask == net:
+            return i
+        i += 1
+    return -1
+
+
+def _compile_ranges(ranges_db: Dict) -> tuple:
+    """
+    Flatten a ranges table into parallel (nets, masks, meta) tuples,
+    ordered longest prefix first so the first hit is the best match
+    """
+    rows = []
+    for rir, ranges in ranges_db.items():
+        for cidr, org, country in ranges:
+            range_ip, prefix = cidr.split('/')
+            prefix = int(prefix)
+            mask_bits = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
+            net_int = int.from_bytes(socket.inet_aton(range_ip), 'big') & mask_bits
+            rows.append((prefix, net_int, mask_bits, (rir, cidr, org, country)))
+    rows.sort(key=lambda row: -row[0])
+    return (tuple(row[1] for row in rows),
+            tuple(row[2] for row in rows),
+            tuple(row[3] for row in rows))
+
+
+_RANGE_NETS, _RANGE_MASKS, _RANGE_META = _compile_ranges(IP_RANGES_DB)
+
+
+def _recv_all(sock: socket.socket, bufsize: int = 65536) -> bytearray:
+    """
+    Read a socket until EOF through one reusable receive buffer
+    Chunks are appended as raw bytes; callers decode the result once
+    """
+    buf = bytearray()
+    chunk = bytearray(bufsize)
+    view = memoryview(chunk)
+    while True:
+        n = sock.recv_into(view)
+        if not n:
+            break
+        buf += view[:n]
+    return buf
+
 
 class WHOISAnalyzer:
     """Analyze IP WHOIS information"""
     
-    # WHOIS server mapping for different RIRs
-    WHOIS_SERVERS = {
-        'ARIN': 'whois.arin.net',  # North America
-        'RIPE': 'whois.ripe.net',  # Europe
-        'APNIC': 'whois.apnic.net',  # Asia-Pacific
-        'LACNIC': 'whois.lacnic.net',  # Latin America
-        'AFNIC': 'whois.afnic.fr',  # Africa
-    }
+    DEFAULT_PORT = 43
     
-    # Built-in IP ranges database (expanded version)
-    IP_RANGES_DB = {
-        'ARIN': [
-            {'range': '1.0.0.0/24', 'org': 'APNIC', 'country': 'AU'},
-            {'range': '1.1.1.0/24', 'org': 'APNIC', 'country': 'AU'},
-            {'range': '8.0.0.0/7', 'org': 'Level 3 Communications', 'country': 'US'},
-            {'range': '10.0.0.0/8', 'org': 'Private-Use', 'country': 'PRIVATE'},
-        ],
-        'RIPE': [
-            {'range': '2.0.0.0/7', 'org': 'RIPE NCC', 'country': 'EU'},
-            {'range': '5.0.0.0/8', 'org': 'RIPE NCC', 'country': 'EU'},
-        ],
-        'APNIC': [
-            {'range': '27.0.0.0/8', 'org': 'APNIC', 'country': 'AU'},
-            {'range': '58.0.0.0/8', 'org': 'APNIC', 'country': 'CN'},
-        ],
-    }
+    # Module-level tables, exposed on the class for existing callers
+    WHOIS_SERVERS = WHOIS_SERVERS
+    IP_RANGES_DB = IP_RANGES_DB
+    COUNTRY_DB = COUNTRY_DB
     
-    # Country codes database
-    COUNTRY_DB = {
-        'US': 'United States',
-        'AU': 'Australia',
-        'CN': 'China',
-        'IN': 'India',
-        'EU': 'European Union',
-        'GB': 'United Kingdom',
-        'DE': 'Germany',
-        'FR': 'France',
-        'JP': 'Japan',
-        'BR': 'Brazil',
-        'PRIVATE': 'Private Network',
+    # WHOIS response keys of interest -> parsed field name
+    _WHOIS_KEY_MAP = {
+        'organization': 'organization',
+        'orgname': 'organization',
+        'country': 'country',
+        'oc': 'country',
+        'cidr': 'network',
+        'netrange': 'network',
+        'netname': 'netname',
+        'comment': 'description',
+        'descr': 'description',
+        'created': 'created',
+        'regdate': 'created',
+        'updated': 'updated',
     }
+    _WHOIS_RE = re.compile(
+        r'^[ \t]*(' + '|'.join(_WHOIS_KEY_MAP) + r')[ \t]*:[ \t]*(.*)$',
+        re.MULTILINE | re.IGNORECASE
+    )
+    
+    # Compiled form of IP_RANGES_DB as parallel tuples (see _compile_ranges)
+    _range_nets = _RANGE_NETS
+    _range_masks = _RANGE_MASKS
+    _range_meta = _RANGE_META
+    
+    def __init__(self, parallel_workers: int = 8, cache_db=None, cache_ttl: int = 86400):
+        """
+        Initialize WHOIS Analyzer
+        parallel_workers: thread count for bulk lookups (1 disables threading)
+        cache_db: optional DatabaseManager persisting results across runs
+        cache_ttl: age in seconds after which persisted results are refetched
+        """
+        self.cache = LRUCache()
+        self.parallel_workers = max(1, int(parallel_workers))
+        self._cache_lock = threading.Lock()
+        self.cache_db = cache_db
+        self.cache_ttl = cache_ttl
     
-    def __init__(self):
-        """Initialize WHOIS Analyzer"""
-        self.cache = {}
+    @classmethod
+    def _compile_ranges(cls) -> None:
+        """Recompile the range tuples after replacing IP_RANGES_DB on a subclass"""
+        cls._range_nets, cls._range_masks, cls._range_meta = _compile_ranges(cls.IP_RANGES_DB)
+    
+    def _match_range(self, ip_int: int) -> Optional[Dict]:
+        """Find the built-in range containing an integer IP"""
+        i = _match_cidr(ip_int, self._range_nets, self._range_masks)
+        if i < 0:
+            return None
+        rir, cidr, org, country = self._range_meta[i]
+        return {
+            'rir': rir,
+            'range': cidr,
+            'organization': org,
+            'country': country,
+            'source': 'local_database'
+        }
     
     def ip_to_asn_range(self, ip: str) -> Optional[Dict]:
         """
         Determine which ASN/RIR range an IP belongs to
         Using built-in database when possible
         """
-        from .ip_utils import IPConverter
-        
-        ip_int = IPConverter.ip_to_int(ip)
-        
-        # Check built-in database first
-        for rir, ranges in self.IP_RANGES_DB.items():
-            for entry in ranges:
-                range_ip, prefix = entry['range'].split('/')
-                prefix = int(prefix)
-                mask_bits = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
-                range_int = IPConverter.ip_to_int(range_ip)
-                
-                if (ip_int & mask_bits) == (range_int & mask_bits):
-                    return {
-                        'rir': rir,
-                        'range': entry['range'],
-                        'organization': entry['org'],
-                        'country': entry['country'],
-                        'source': 'local_database'
-                    }
-        
-        return None
+        return self._match_range(IPConverter.ip_to_int(ip))
     
-    def query_whois_socket(self, ip: str, server: str = 'whois.arin.net') -> Optional[str]:
+    def ip_to_asn_range_bulk(self, ips: List[str]) -> List[Optional[Dict]]:
+        """Resolve built-in ASN/RIR ranges for many IPs in one call"""
+        to_int = IPConverter.ip_to_int
+        match = self._match_range
+        return [match(to_int(ip)) for ip in ips]
+    
+    def _query_server(self, server: str, query: str, timeout: int = 5) -> Optional[str]:
+        """Send one query to a WHOIS server and return the decoded response"""
+        try:
+            addr = _server_address(server, self.DEFAULT_PORT)
+            with socket.create_connection(addr, timeout=timeout) as sock:
+                sock.sendall(f"{query}\r\n".encode())
+                response = _recv_all(sock)
+        except (socket.error, socket.timeout):
+            # Re-resolve next time in case the server moved
+            _SERVER_ADDRS.pop((server, self.DEFAULT_PORT), None)
+            return None
+        return response.decode('utf-8', errors='replace')
+    
+    def find_referral_server(self, ip: str) -> Optional[str]:
+        """
+        Ask IANA which WHOIS server is authoritative for an IP
+        IPv4 answers are remembered per first octet, so each /8 costs one
+        IANA round-trip per process
+        """
+        octet = ip.split('.', 1)[0] if '.' in ip and ':' not in ip else None
+        if octet is not None:
+            server = _REFERRAL_CACHE.get(octet)
+            if server is not None:
+                return server
+        response = self._query_server(IANA_WHOIS_SERVER, ip)
+        match = _REFER_RE.search(response) if response else None
+        if match is None:
+            return None
+        server = match.group(1)
+        if octet is not None:
+            _REFERRAL_CACHE[octet] = server
+        return server
+    
+    def query_whois_socket(self, ip: str, server: str = 'whois.arin.net',
+                           referral_follow: bool = False) -> Optional[str]:
         """
         Query WHOIS server via socket (offline capable)
+        referral_follow: resolve the authoritative server through IANA first,
+        falling back to `server` when no referral is returned
         Returns raw WHOIS response
         """
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            sock.connect((server, 43))
-            sock.send(f"{ip}\r\n".encode())
-            
-            response = b""
-            while True:
-                data = sock.recv(4096)
-                if not data:
-                    break
-                response += data
-            
-            sock.close()
-            return response.decode('utf-8', errors='ignore')
-        except (socket.error, socket.timeout) as e:
-            return None
+        if referral_follow:
+            server = self.find_referral_server(ip) or server
+        return self._query_server(server, ip)
     
     def parse_whois_response(self, response: str) -> Dict:
         """Parse WHOIS response into structured data"""
@@ -166,23 +273,9 @@ class WHOISAnalyzer:
             'raw': response
         }
         
-        lines = response.split('\n')
-        for line in lines:
-            line = line.strip()
-            if line.startswith('Organization:') or line.startswith('OrgName:'):
-                data['organization'] = line.split(':', 1)[1].strip()
-            elif line.startswith('Country:') or line.startswith('OC:'):
-                data['country'] = line.split(':', 1)[1].strip()
-            elif line.startswith('CIDR:') or line.startswith('NetRange:'):
-                data['network'] = line.split(':', 1)[1].strip()
-            elif line.startswith('NetName:'):
-                data['netname'] = line.split(':', 1)[1].strip()
-            elif line.startswith('Comment:') or line.startswith('Descr:'):
-                data['description'] = line.split(':', 1)[1].strip()
-            elif line.startswith('Created:') or line.startswith('RegDate:'):
-                data['created'] = line.split(':', 1)[1].strip()
-            elif line.startswith('Updated:') or line.startswith('Updated:'):
-                data['updated'] = line.split(':', 1)[1].strip()
+        key_map = self._WHOIS_KEY_MAP
+        for match in self._WHOIS_RE.finditer(response):
+            data[key_map[match.group(1).lower()]] = match.group(2).strip()
         
         return data
     
@@ -191,10 +284,16 @@ class WHOISAnalyzer:
         Comprehensive IP analysis
         Returns WHOIS information and IP classification
         """
-        if ip in self.cache:
-            return self.cache[ip]
+        cached = self.cache.get(ip)
+        if cached is not None:
+            return cached
         
-        from .ip_utils import IPClassifier
+        if self.cache_db is not None:
+            stored = self.cache_db.get_whois_cache(ip, self.cache_ttl)
+            if stored is not None:
+                with self._cache_lock:
+                    self.cache[ip] = stored
+                return stored
         
         result = {
             'ip': ip,
@@ -215,7 +314,8 @@ class WHOISAnalyzer:
             # If not private, try to query actual WHOIS (if network available)
             if not result['is_private']:
                 try:
-                    response = self.query_whois_socket(ip)
+                    # IANA names the authoritative RIR; cached per /8
+                    response = self.query_whois_socket(ip, referral_follow=True)
                     if response:
                         result['whois'] = self.parse_whois_response(response)
                         result['whois']['source'] = 'live_whois'
@@ -224,7 +324,10 @@ class WHOISAnalyzer:
                 except:
                     result['whois']['source'] = 'unavailable'
         
-        self.cache[ip] = result
+        with self._cache_lock:
+            self.cache[ip] = result
+        if self.cache_db is not None and result['whois'].get('source') != 'unavailable':
+            self.cache_db.store_whois_cache(ip, result)
         return result
 
     # Compatibility method expected by callers/tests
@@ -232,7 +335,17 @@ class WHOISAnalyzer:
         return self.analyze_ip(ip)
     
     def get_bulk_analysis(self, ips: list) -> list:
-        """Analyze multiple IPs"""
+        """
+        Analyze multiple IPs
+        Uncached IPs are looked up concurrently so live WHOIS round-trips overlap
+        """
+        cache = self.cache
+        pending = list(dict.fromkeys(ip for ip in ips if ip not in cache))
+        if len(pending) > 1 and self.parallel_workers > 1:
+            workers = min(self.parallel_workers, len(pending))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for _ in executor.map(self.analyze_ip, pending):
+                    pass
         return [self.analyze_ip(ip) for ip in ips]
     
     def get_country_name(self, country_code: str) -> str:
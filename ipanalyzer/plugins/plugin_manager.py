@@ -22,8 +22,59 @@ class PluginManager:
 """Plugin manager for discovering and loading simple plugins."""
 import os
 import json
+import threading
 import importlib.util
-from typing import Dict
+from types import ModuleType
+from typing import Dict, Tuple
+
+# Executed plugin modules shared across PluginManager instances, keyed on the
+# entry file path and validated against its (mtime_ns, size)
+_MODULE_CACHE: Dict[str, Tuple[Tuple[int, int], ModuleType]] = {}
+_MODULE_CACHE_LOCK = threading.Lock()
+
+# Aggregated plugin.json manifests kept in the plugin directory:
+# {"version": 1, "plugins": {dir_name: {"stamp": [mtime_ns, size], "meta": {...}}}}
+_INDEX_NAME = '_index.json'
+_INDEX_VERSION = 1
+
+
+def _read_index(index_path: str) -> Dict[str, Dict]:
+    try:
+        with open(index_path, 'rb') as f:
+            index = json.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(index, dict) or index.get('version') != _INDEX_VERSION:
+        return {}
+    return index.get('plugins') or {}
+
+
+def _write_index(index_path: str, plugins: Dict[str, Dict]) -> None:
+    tmp_path = f'{index_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': _INDEX_VERSION, 'plugins': plugins}, f)
+        os.replace(tmp_path, index_path)
+    except OSError:
+        # Read-only plugin directories simply go without an index
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _load_module(name: str, main_path: str) -> ModuleType:
+    st = os.stat(main_path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _MODULE_CACHE_LOCK:
+        cached = _MODULE_CACHE.get(main_path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        spec = importlib.util.spec_from_file_location(name, main_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _MODULE_CACHE[main_path] = (stamp, module)
+        return module
 
 
 class PluginManager:
@@ -34,27 +85,40 @@ class PluginManager:
 
     def load_plugins(self):
         self.plugins = {}
-        if not os.path.isdir(self.plugin_dir):
+        try:
+            entries = list(os.scandir(self.plugin_dir))
+        except OSError:
             return
-        for name in os.listdir(self.plugin_dir):
-            path = os.path.join(self.plugin_dir, name)
-            if not os.path.isdir(path):
-                continue
-            config_path = os.path.join(path, 'plugin.json')
-            if not os.path.exists(config_path):
+        # Manifests unchanged since the index was written are taken from it,
+        # so only a stat (not an open + parse) is paid per plugin
+        index_path = os.path.join(self.plugin_dir, _INDEX_NAME)
+        index = _read_index(index_path)
+        manifests: Dict[str, Dict] = {}
+        for entry in entries:
+            if not entry.is_dir():
                 continue
+            name = entry.name
+            path = entry.path
             try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    cfg = json.load(f)
-                main = cfg.get('main')
-                main_path = os.path.join(path, main)
-                if os.path.exists(main_path):
-                    spec = importlib.util.spec_from_file_location(cfg.get('name', name), main_path)
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    self.plugins[cfg.get('name', name)] = {'meta': cfg, 'module': module}
+                config_path = os.path.join(path, 'plugin.json')
+                st = os.stat(config_path)
+                stamp = [st.st_mtime_ns, st.st_size]
+                cached = index.get(name)
+                if cached is not None and cached.get('stamp') == stamp:
+                    cfg = cached['meta']
+                else:
+                    with open(config_path, 'rb') as f:
+                        cfg = json.loads(f.read())
+                manifests[name] = {'stamp': stamp, 'meta': cfg}
+                main_path = os.path.join(path, cfg.get('main'))
+                if os.path.isfile(main_path):
+                    plugin_name = cfg.get('name', name)
+                    module = _load_module(plugin_name, main_path)
+                    self.plugins[plugin_name] = {'meta': cfg, 'module': module}
             except Exception:
                 continue
+        if manifests != index:
+            _write_index(index_path, manifests)
 
     def list_plugins(self):
         return list(self.plugins.keys())
@@ -29,63 +29,268 @@ class DatabaseManager:
     def close(self):
         self._conn.close()
 """Database manager using SQLite for local persistent storage."""
+import ast
+import csv
+import io
+import json
 import sqlite3
-from typing import Optional, List, Dict
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Optional, List, Dict, TextIO, Tuple
 import os
 from datetime import datetime, timedelta
 
+from ..modules._timeutil import utc_now_iso
+
+# Bumped whenever _initialize_schema gains a data migration
+SCHEMA_VERSION = 3
+
+# Serialized payloads at least this long are stored zlib-compressed as a
+# BLOB, prefixed with a one-byte codec tag; shorter ones stay plain JSON text.
+COMPRESS_MIN_BYTES = 1024
+_TAG_ZLIB = b'\x01'
+
 
 class DatabaseManager:
     def __init__(self, db_type: str = 'sqlite', db_path: Optional[str] = None):
         if db_type != 'sqlite':
             raise NotImplementedError('Only sqlite backend is implemented')
         self.db_path = db_path or os.path.join(os.getcwd(), 'ip_analyzer_data.sqlite')
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Autocommit at the driver level; multi-statement writes go through _transaction()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._configure_connection()
         self._initialize_schema()
+        self._insert_cur = self.conn.cursor()
+
+    def _configure_connection(self):
+        # WAL lets readers run alongside the writer and, with synchronous=NORMAL,
+        # fsyncs only at checkpoints instead of on every commit.
+        # auto_vacuum only takes effect on a fresh file, before any table exists.
+        for pragma in ('PRAGMA auto_vacuum=INCREMENTAL',
+                       'PRAGMA journal_mode=WAL',
+                       'PRAGMA synchronous=NORMAL',
+                       'PRAGMA temp_store=MEMORY',
+                       'PRAGMA mmap_size=268435456',
+                       'PRAGMA cache_size=-65536'):
+            self.conn.execute(pragma)
+
+    @contextmanager
+    def _transaction(self):
+        """Run the block as one BEGIN IMMEDIATE ... COMMIT unit, serialised across threads."""
+        with self._lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
 
     def _initialize_schema(self):
-        cur = self.conn.cursor()
+        with self._transaction() as conn:
+            self._create_schema(conn.cursor())
+
+    def _create_schema(self, cur):
         cur.execute('''
         CREATE TABLE IF NOT EXISTS analyses (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             ip TEXT,
             analysis_type TEXT,
             data TEXT,
-            created_at TEXT
+            created_at TEXT,
+            payload BLOB,
+            threat_level TEXT
         )
         ''')
+        # (ip, created_at) serves both lookups by ip and query_history's ordering
         cur.execute('''
-        CREATE INDEX IF NOT EXISTS idx_analyses_ip ON analyses(ip)
+        CREATE INDEX IF NOT EXISTS idx_ip_created ON analyses(ip, created_at DESC)
         ''')
-        self.conn.commit()
+        cur.execute('DROP INDEX IF EXISTS idx_analyses_ip')
+        cur.execute('''
+        CREATE INDEX IF NOT EXISTS idx_created ON analyses(created_at)
+        ''')
+        cur.execute('''
+        CREATE TABLE IF NOT EXISTS whois_cache (
+            ip TEXT PRIMARY KEY,
+            ts INTEGER,
+            payload TEXT
+        )
+        ''')
+        version = cur.execute('PRAGMA user_version').fetchone()[0]
+        if version < 1:
+            self._migrate_payloads_to_json(cur)
+        if version < 2:
+            columns = {row[1] for row in cur.execute('PRAGMA table_info(analyses)')}
+            if 'payload' not in columns:
+                cur.execute('ALTER TABLE analyses ADD COLUMN payload BLOB')
+        if version < 3:
+            columns = {row[1] for row in cur.execute('PRAGMA table_info(analyses)')}
+            if 'threat_level' not in columns:
+                cur.execute('ALTER TABLE analyses ADD COLUMN threat_level TEXT')
+            self._backfill_threat_levels(cur)
+        # threat_level is a plain column so compressed rows filter in SQL too
+        cur.execute('''
+        CREATE INDEX IF NOT EXISTS idx_threat_level ON analyses(threat_level, created_at DESC)
+        ''')
+        cur.execute('DROP INDEX IF EXISTS idx_compressed')
+        if version < SCHEMA_VERSION:
+            cur.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        # Superseded by idx_threat_level; no query needs SQLite's JSON1 now
+        cur.execute('DROP INDEX IF EXISTS idx_analyses_threat_level')
+
+    def _migrate_payloads_to_json(self, cur):
+        """Rewrite payloads stored as Python reprs (str(dict)) into JSON."""
+        updates = []
+        for row_id, raw in cur.execute('SELECT id, data FROM analyses').fetchall():
+            try:
+                json.loads(raw)
+                continue
+            except (TypeError, ValueError):
+                pass
+            try:
+                value = ast.literal_eval(raw)
+            except (ValueError, SyntaxError):
+                value = raw
+            updates.append((self._serialize(value), row_id))
+        cur.executemany('UPDATE analyses SET data = ? WHERE id = ?', updates)
+
+    def _backfill_threat_levels(self, cur):
+        """Copy threat_level out of stored payloads into its own column."""
+        updates = []
+        for row_id, text, blob in cur.execute('SELECT id, data, payload FROM analyses').fetchall():
+            try:
+                level = self._threat_level(json.loads(self._payload_text(text, blob)))
+            except (TypeError, ValueError):
+                continue
+            if level is not None:
+                updates.append((level, row_id))
+        cur.executemany('UPDATE analyses SET threat_level = ? WHERE id = ?', updates)
+
+    @staticmethod
+    def _threat_level(data: Any) -> Optional[str]:
+        return data.get('threat_level') if isinstance(data, dict) else None
+
+    @staticmethod
+    def _serialize(data: Any) -> str:
+        return json.dumps(data, default=str, separators=(',', ':'))
+
+    @classmethod
+    def _encode(cls, data: Any) -> Tuple[Optional[str], Optional[bytes]]:
+        """Return (json_text, None) for small payloads or (None, compressed_blob)."""
+        text = cls._serialize(data)
+        if len(text) < COMPRESS_MIN_BYTES:
+            return text, None
+        return None, _TAG_ZLIB + zlib.compress(text.encode('utf-8'))
+
+    @classmethod
+    def _encode_single(cls, data: Any):
+        """Like _encode, for tables keeping either form in one payload column."""
+        text, blob = cls._encode(data)
+        return blob if blob is not None else text
+
+    @staticmethod
+    def _payload_text(text: Optional[str], blob: Optional[bytes]) -> str:
+        """JSON text of a stored payload, whichever form it was written in."""
+        if blob is None:
+            return text
+        if blob[:1] != _TAG_ZLIB:
+            raise ValueError(f'Unknown payload codec tag: {blob[:1]!r}')
+        return zlib.decompress(blob[1:]).decode('utf-8')
+
+    def _row_to_dict(self, row: Tuple) -> Dict:
+        row_id, ip, analysis_type, text, created_at, blob = row
+        return {'id': row_id, 'ip': ip, 'type': analysis_type,
+                'data': json.loads(self._payload_text(text, blob)), 'created_at': created_at}
 
     def store_analysis(self, analysis_type: str, data: Dict) -> int:
-        cur = self.conn.cursor()
         ip = data.get('ip') or data.get('network') or ''
-        cur.execute('INSERT INTO analyses (ip, analysis_type, data, created_at) VALUES (?, ?, ?, ?)',
-                    (ip, analysis_type, str(data), datetime.utcnow().isoformat()))
-        self.conn.commit()
-        return cur.lastrowid
+        row = (ip, analysis_type, *self._encode(data), utc_now_iso(), self._threat_level(data))
+        with self._lock:
+            cur = self._insert_cur
+            cur.execute('INSERT INTO analyses (ip, analysis_type, data, payload, created_at, threat_level) '
+                        'VALUES (?, ?, ?, ?, ?, ?)', row)
+            return cur.lastrowid
+
+    def store_analyses_bulk(self, items: List[Tuple[str, Dict]]) -> int:
+        """Store many (analysis_type, data) pairs in a single transaction."""
+        created_at = utc_now_iso()  # one timestamp shared by the whole batch
+        encode = self._encode
+        threat_level = self._threat_level
+        rows = ((data.get('ip') or data.get('network') or '', analysis_type, *encode(data), created_at,
+                 threat_level(data))
+                for analysis_type, data in items)
+        with self._transaction() as conn:
+            cur = conn.executemany(
+                'INSERT INTO analyses (ip, analysis_type, data, payload, created_at, threat_level) '
+                'VALUES (?, ?, ?, ?, ?, ?)', rows)
+        return cur.rowcount
+
+    def get_whois_cache(self, ip_address: str, max_age: int = 86400) -> Optional[Dict]:
+        """Return a cached WHOIS analysis younger than max_age seconds, if any."""
+        with self._lock:
+            row = self.conn.execute('SELECT payload FROM whois_cache WHERE ip = ? AND ts > ?',
+                                    (ip_address, int(time.time()) - max_age)).fetchone()
+        if row is None:
+            return None
+        payload = row[0]
+        if isinstance(payload, bytes):
+            payload = self._payload_text(None, payload)
+        return json.loads(payload)
+
+    def store_whois_cache(self, ip_address: str, data: Dict) -> None:
+        with self._lock:
+            self.conn.execute('INSERT OR REPLACE INTO whois_cache (ip, ts, payload) VALUES (?, ?, ?)',
+                              (ip_address, int(time.time()), self._encode_single(data)))
 
     def query_history(self, ip_address: str) -> List[Dict]:
         cur = self.conn.cursor()
-        cur.execute('SELECT id, ip, analysis_type, data, created_at FROM analyses WHERE ip = ? ORDER BY created_at DESC', (ip_address,))
-        rows = cur.fetchall()
-        return [{'id': r[0], 'ip': r[1], 'type': r[2], 'data': r[3], 'created_at': r[4]} for r in rows]
+        cur.execute('SELECT id, ip, analysis_type, data, created_at, payload FROM analyses '
+                    'WHERE ip = ? ORDER BY created_at DESC', (ip_address,))
+        return [self._row_to_dict(r) for r in cur]
 
-    def export_data(self, format: str = 'csv') -> str:
-        cur = self.conn.cursor()
-        cur.execute('SELECT id, ip, analysis_type, data, created_at FROM analyses')
-        rows = cur.fetchall()
-        if format == 'csv':
-            lines = ['id,ip,analysis_type,created_at,data']
-            for r in rows:
-                lines.append(f'"{r[0]}","{r[1]}","{r[2]}","{r[4]}","{r[3]}"')
-            return '\n'.join(lines)
-        raise ValueError('Unsupported export format')
-
-    def cleanup_old_records(self, days: int = 90):
-        cutoff = datetime.utcnow() - timedelta(days=days)
+    def query_threat_level(self, threat_level: str) -> List[Dict]:
+        """Return stored analyses whose payload has the given threat_level."""
         cur = self.conn.cursor()
-        cur.execute('DELETE FROM analyses WHERE created_at < ?', (cutoff.isoformat(),))
-        self.conn.commit()
+        cur.execute('SELECT id, ip, analysis_type, data, created_at, payload FROM analyses '
+                    'WHERE threat_level = ? ORDER BY created_at DESC', (threat_level,))
+        return [self._row_to_dict(r) for r in cur]
+
+    def export_data(self, format: str = 'csv', file: Optional[TextIO] = None) -> Optional[str]:
+        """
+        Export all analyses as CSV.
+
+        Rows are streamed from the cursor into `file` when one is given (and
+        None is returned); otherwise the CSV text is returned.
+        """
+        if format != 'csv':
+            raise ValueError('Unsupported export format')
+        out = file if file is not None else io.StringIO()
+        writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(('id', 'ip', 'analysis_type', 'created_at', 'data'))
+        cur = self.conn.execute('SELECT id, ip, analysis_type, created_at, data, payload FROM analyses')
+        payload_text = self._payload_text
+        writer.writerows((r[0], r[1], r[2], r[3], payload_text(r[4], r[5])) for r in cur)
+        if file is not None:
+            return None
+        return out.getvalue().rstrip('\n')
+
+    def cleanup_old_records(self, days: int = 90, batch_size: int = 10000) -> int:
+        """Delete analyses older than `days` in short batches; return the count removed."""
+        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        removed = 0
+        while True:
+            with self._transaction() as conn:
+                cur = conn.execute(
+                    'DELETE FROM analyses WHERE id IN '
+                    '(SELECT id FROM analyses WHERE created_at < ? LIMIT ?)',
+                    (cutoff, batch_size))
+            removed += cur.rowcount
+            if cur.rowcount < batch_size:
+                break
+        with self._lock:
+            self.conn.execute('PRAGMA incremental_vacuum')
+        return removed
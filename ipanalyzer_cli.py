@@ -1,10 +1,10 @@
 """Minimal CLI for the IPAnalyzer package."""
 import argparse
 import json
-from ipanalyzer import GeoIPAnalyzer, BGPAnalyzer, DNSBulkProcessor, ThreatIntel, ReportGenerator
 
 
 def whois_cmd(args):
+    from ipanalyzer import GeoIPAnalyzer, ThreatIntel, ReportGenerator
     geo = GeoIPAnalyzer()
     ti = ThreatIntel()
     info = geo.lookup(args.ip)
@@ -14,16 +14,18 @@ def whois_cmd(args):
     else:
         print(info)
         if args.output:
-            html = ReportGenerator().generate_html(info)
-            ReportGenerator().save(html, args.output)
+            gen = ReportGenerator()
+            gen.save(gen.generate_html(info), args.output)
 
 
 def bgp_cmd(args):
+    from ipanalyzer import BGPAnalyzer
     b = BGPAnalyzer()
     print(b.get_asn_for_ip(args.ip))
 
 
 def dns_bulk_cmd(args):
+    from ipanalyzer import DNSBulkProcessor
     proc = DNSBulkProcessor()
     hosts = [h.strip() for h in args.hosts.split(',') if h.strip()]
     res = proc.bulk_resolve(hosts)
@@ -62,172 +64,262 @@ Main CLI Interface for IPAnalyzer
 """
 
 import argparse
+import mmap
+import re
+import socket
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
-from ipanalyzer import (
-    WHOISAnalyzer,
-    NetworkScanner,
-    IPRangeAnalyzer,
-    ReportGenerator,
-    GeoIPAnalyzer,
-    DNSBulkProcessor,
-    BGPAnalyzer,
-    ThreatIntelligence,
-    DatabaseManager,
-    PluginManager,
-    IPAnalyzerGUI,
-)
+# Analyzers are imported inside their command handlers so a single command
+# only loads the subsystems it uses (the GUI pulls in tkinter, for example)
 from ipanalyzer.modules.ip_utils import IPValidator
 
+try:
+    import orjson  # optional C-accelerated JSON encoder
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj):
+    """Indented JSON text for large results; uses orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass  # e.g. integers wider than 64 bits; the stdlib encoder handles them
+    return json.dumps(obj, indent=2)
 
-def create_parser():
-    """Create command-line argument parser"""
-    parser = argparse.ArgumentParser(
-        description='IPAnalyzer - Advanced IP Analysis Tool',
-        epilog='Created by MrAmirRezaie',
-        formatter_class=argparse.RawDescriptionHelpFormatter
-    )
-    
-    subparsers = parser.add_subparsers(dest='command', help='Available commands')
-    
-    # WHOIS command
-    whois_parser = subparsers.add_parser('whois', help='WHOIS lookup for IP address')
-    whois_parser.add_argument('ip', help='IP address to analyze')
-    whois_parser.add_argument('-o', '--output', help='Output HTML file')
-    whois_parser.add_argument('--json', action='store_true', help='Output as JSON')
-    
-    # Network scan command
-    scan_parser = subparsers.add_parser('scan', help='Scan network for connected devices')
-    scan_parser.add_argument('--range', help='Network range (e.g., 192.168.1.0/24)')
-    scan_parser.add_argument('-o', '--output', help='Output HTML file')
-    scan_parser.add_argument('--json', action='store_true', help='Output as JSON')
-    scan_parser.add_argument('--ports', help='Scan ports on discovered devices')
-    
-    # IP range analysis command
-    range_parser = subparsers.add_parser('range', help='Analyze IP ranges and CIDR')
-    range_parser.add_argument('cidr', help='CIDR notation (e.g., 192.168.1.0/24)')
-    range_parser.add_argument('--subnet', type=int, help='Divide into subnets with prefix')
-    range_parser.add_argument('--list-ips', action='store_true', help='List all IPs in range')
-    range_parser.add_argument('--limit', type=int, default=1000, help='Limit IPs listed')
-    range_parser.add_argument('-o', '--output', help='Output HTML file')
-    range_parser.add_argument('--json', action='store_true', help='Output as JSON')
-    
-    # Port scan command
-    port_parser = subparsers.add_parser('ports', help='Scan ports on a host')
-    port_parser.add_argument('ip', help='IP address to scan')
-    port_parser.add_argument('--ports', help='Comma-separated ports to scan')
-    port_parser.add_argument('-o', '--output', help='Output HTML file')
-    port_parser.add_argument('--json', action='store_true', help='Output as JSON')
-    
-    # Batch analysis command
-    batch_parser = subparsers.add_parser('batch', help='Batch analyze multiple IPs')
-    batch_parser.add_argument('file', help='File with IPs/CIDRs (one per line)')
-    batch_parser.add_argument('-o', '--output', help='Output HTML file')
-    batch_parser.add_argument('--json', action='store_true', help='Output as JSON')
-
-    # GeoIP command
-    geoip_parser = subparsers.add_parser('geoip', help='GeoIP lookup (offline)')
-    geoip_parser.add_argument('ip', nargs='?', help='IP address to lookup')
-    geoip_parser.add_argument('--file', help='File with IPs (one per line)')
-
-    # DNS bulk command
-    dns_parser = subparsers.add_parser('dns', help='Bulk DNS processing')
-    dns_group = dns_parser.add_mutually_exclusive_group(required=True)
-    dns_group.add_argument('--forward', help='File with hostnames for forward lookup')
-    dns_group.add_argument('--reverse', help='File with IPs for reverse lookup')
-    dns_parser.add_argument('--threads', type=int, default=8, help='Number of threads')
-
-    # BGP command
-    bgp_parser = subparsers.add_parser('bgp', help='BGP route information (offline)')
-    bgp_parser.add_argument('ip', help='IP address to analyze')
-
-    # Threat intelligence
-    threat_parser = subparsers.add_parser('threat', help='Threat intelligence lookup')
-    threat_parser.add_argument('ip', nargs='?', help='IP address to check')
-
-    # GUI
-    gui_parser = subparsers.add_parser('gui', help='Launch GUI application')
-
-    # Database management
-    db_parser = subparsers.add_parser('db', help='Database storage operations')
-    db_parser.add_argument('action', choices=['store', 'query'], help='Action')
-    db_parser.add_argument('--file', help='File to store or import')
-    db_parser.add_argument('--ip', help='IP to query')
-
-    # Plugins
-    plugins_parser = subparsers.add_parser('plugins', help='Plugin manager')
-    plugins_parser.add_argument('--list', action='store_true', help='List available plugins')
-    plugins_parser.add_argument('--exec', dest='exec', action='store_true', help='Execute a plugin')
-    plugins_parser.add_argument('--plugin', help='Plugin name to execute')
-    plugins_parser.add_argument('args', nargs='*', help='Arguments for plugin')
-    
-    return parser
+
+# Shared analyzer instances: built (and their data files loaded) on first use,
+# then reused by every handler in the process
+@lru_cache(maxsize=1)
+def _geo():
+    from ipanalyzer import GeoIPAnalyzer
+    return GeoIPAnalyzer()
+
+
+@lru_cache(maxsize=1)
+def _bgp():
+    from ipanalyzer import BGPAnalyzer
+    return BGPAnalyzer()
+
+
+@lru_cache(maxsize=1)
+def _threat():
+    from ipanalyzer import ThreatIntelligence
+    return ThreatIntelligence()
+
+
+@lru_cache(maxsize=1)
+def _whois():
+    from ipanalyzer import WHOISAnalyzer
+    return WHOISAnalyzer()
+
+
+# Same acceptance as IPValidator.is_valid_ipv4 / is_valid_cidr (1-3 digit
+# octets up to 255, optional /0-/32 prefix), checked by one regex call per entry
+_OCTET = r'(?:25[0-5]|2[0-4][0-9]|[01]?[0-9]?[0-9])'
+_BATCH_ENTRY_RE = re.compile(
+    rf'{_OCTET}\.{_OCTET}\.{_OCTET}\.{_OCTET}(/(?:3[0-2]|[0-2]?[0-9]))?'
+)
+
+
+def _read_entries(path):
+    """
+    Read a one-entry-per-line file (hostnames, IPs) as a list of str
+    The file is memory-mapped and read line by line without copying it
+    whole; surrounding whitespace is stripped and blank lines are dropped
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            stripped = (line.strip() for line in iter(mm.readline, b''))
+            return [entry.decode('utf-8', errors='replace') for entry in stripped if entry]
+
+
+def _read_text(path):
+    with open(path, 'r') as f:
+        return f.read()
+
+
+def _read_input_dir(directory, workers=16):
+    """
+    Read every regular file in `directory` (name order) as batch lines
+    The opens and reads are overlapped on a thread pool
+    """
+    with os.scandir(directory) as it:
+        paths = sorted(entry.path for entry in it if entry.is_file())
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(paths)))) as executor:
+        return [line for text in executor.map(_read_text, paths) for line in text.splitlines()]
+
+
+# Batch progress lines are emitted in blocks of this many entries
+_PROGRESS_CHUNK = 100
+
+
+# Batch files are usually homogeneous; this many leading lines pick the loop
+_CLASSIFY_SAMPLE = 64
+
+
+def _classify_entries(lines):
+    """
+    Split batch file lines into analyzable entries and invalid ones
+    Returns ([(is_cidr, entry), ...], [invalid_entry, ...]); blanks and
+    '#' comments are dropped
+    """
+    sample = [ln.strip() for ln in lines[:_CLASSIFY_SAMPLE]]
+    if all('/' not in ln for ln in sample):
+        return _classify_plain(lines)
+    if all('/' in ln for ln in sample if ln and ln[0] != '#'):
+        return _classify_cidrs(lines)
+    return _classify_mixed(lines)
+
+
+def _classify_plain(lines):
+    """_classify_entries() loop for address lists: inet_pton first, regex for the rest"""
+    match = _BATCH_ENTRY_RE.fullmatch
+    pton = socket.inet_pton
+    af_inet = socket.AF_INET
+    entries = []
+    invalid = []
+    for line in lines:
+        line = line.strip()
+        try:
+            pton(af_inet, line)
+            entries.append((False, line))
+            continue
+        except (OSError, ValueError):
+            pass
+        if not line or line[0] == '#':
+            continue
+        m = match(line)
+        if m is None:
+            invalid.append(line)
+        else:
+            entries.append((m.group(1) is not None, line))
+    return entries, invalid
+
+
+def _classify_cidrs(lines):
+    """_classify_entries() loop for CIDR lists: straight to the regex"""
+    match = _BATCH_ENTRY_RE.fullmatch
+    entries = []
+    invalid = []
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] == '#':
+            continue
+        m = match(line)
+        if m is None:
+            invalid.append(line)
+        else:
+            entries.append((m.group(1) is not None, line))
+    return entries, invalid
+
+
+def _classify_mixed(lines):
+    """_classify_entries() loop for mixed files"""
+    match = _BATCH_ENTRY_RE.fullmatch
+    pton = socket.inet_pton
+    af_inet = socket.AF_INET
+    entries = []
+    invalid = []
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] == '#':
+            continue
+        if '/' not in line:
+            # Plain addresses: libc's strict dotted-quad parser settles
+            # most lines; the regex only sees the ones it rejects
+            try:
+                pton(af_inet, line)
+                entries.append((False, line))
+                continue
+            except (OSError, ValueError):
+                pass
+        m = match(line)
+        if m is None:
+            invalid.append(line)
+        else:
+            entries.append((m.group(1) is not None, line))
+    return entries, invalid
 
 
 def cmd_geoip(args):
     """Handle GeoIP lookup"""
-    geo = GeoIPAnalyzer()
+    geo = _geo()
     if hasattr(args, 'ip') and args.ip:
         res = geo.analyze(args.ip)
-        import json
-        print(json.dumps(res, indent=2))
+        print(_dumps(res))
     elif hasattr(args, 'file') and args.file:
-        res = geo.batch_analyze(open(args.file).read().splitlines())
-        import json
-        print(json.dumps(res, indent=2))
+        ips = _read_entries(args.file)
+        unique = list(dict.fromkeys(ips))
+        by_ip = dict(zip(unique, geo.batch_analyze(unique)))
+        res = [by_ip[ip] for ip in ips]
+        print(_dumps(res))
 
 
 def cmd_dns(args):
+    import asyncio
+    from ipanalyzer import DNSBulkProcessor
     proc = DNSBulkProcessor(threads=getattr(args, 'threads', 8), timeout=5)
+    concurrency = getattr(args, 'concurrency', 1000)
+    # Lookups are latency-bound, so they run concurrently on one event loop
     if args.forward:
-        res = proc.forward_lookup_batch(open(args.forward).read().splitlines())
-        print(proc.export_results(res, format='csv'))
+        # Results are keyed by hostname, so repeats only cost duplicate lookups
+        hosts = list(dict.fromkeys(_read_entries(args.forward)))
+        res = asyncio.run(proc.forward_lookup_batch_async(hosts, concurrency))
     elif args.reverse:
-        res = proc.reverse_lookup_batch(open(args.reverse).read().splitlines())
-        print(proc.export_results(res, format='csv'))
+        ips = list(dict.fromkeys(_read_entries(args.reverse)))
+        res = asyncio.run(proc.reverse_lookup_batch_async(ips, concurrency))
+    else:
+        return
+    # Stream the rows rather than building the whole export in memory
+    sys.stdout.writelines(line + '\n' for line in proc.iter_export_results(res, format='csv'))
 
 
 def cmd_bgp(args):
-    analyzer = BGPAnalyzer()
+    analyzer = _bgp()
     res = analyzer.analyze_ip(args.ip)
-    import json
     print(json.dumps(res, indent=2))
 
 
 def cmd_threat(args):
-    ti = ThreatIntelligence()
+    ti = _threat()
     if args.ip:
         res = ti.analyze_threat(args.ip)
-        import json
         print(json.dumps(res, indent=2))
 
 
 def cmd_gui(args):
+    from ipanalyzer.gui import IPAnalyzerGUI
     gui = IPAnalyzerGUI()
     gui.run()
 
 
 def cmd_db(args):
+    from ipanalyzer import DatabaseManager
     db = DatabaseManager()
     if args.action == 'store' and args.file:
-        # naive: store each line as a record
+        # Each line becomes a record; all of them go in one transaction
         with open(args.file, 'r', encoding='utf-8') as f:
-            for ln in f:
-                ln = ln.strip()
-                if not ln:
-                    continue
-                db.store_analysis('batch', {'ip': ln, 'raw': ln})
+            lines = [ln.strip() for ln in f]
+        db.store_analyses_bulk(('batch', {'ip': ln, 'raw': ln}) for ln in lines if ln)
         print('Stored batch entries')
     elif args.action == 'query' and args.ip:
         res = db.query_history(args.ip)
-        import json
         print(json.dumps(res, indent=2))
 
 
 def cmd_plugins(args):
+    from ipanalyzer import PluginManager
     mgr = PluginManager()
     if args.list:
         print('\n'.join(mgr.list_plugins()))
@@ -236,6 +328,13 @@ def cmd_plugins(args):
         print(out)
 
 
+def _save_report(result, path):
+    """Write the HTML report for `result` to `path`, creating its directory"""
+    from ipanalyzer import ReportGenerator
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    ReportGenerator().generate_html_report(result, path)
+
+
 def cmd_whois(args):
     """Handle WHOIS command"""
     if not IPValidator.is_valid_ipv4(args.ip):
@@ -244,18 +343,16 @@ def cmd_whois(args):
     
     print(f"🔍 Analyzing IP: {args.ip}")
     
-    analyzer = WHOISAnalyzer()
+    analyzer = _whois()
     result = analyzer.analyze_ip(args.ip)
     
     if args.json:
-        import json
         print(json.dumps(result, indent=2))
     else:
         print_whois_result(result)
     
     if args.output:
-        generator = ReportGenerator()
-        html = generator.generate_html_report(result, args.output)
+        _save_report(result, args.output)
         print(f"✅ Report saved to: {args.output}")
 
 
@@ -263,6 +360,7 @@ def cmd_scan(args):
     """Handle network scan command"""
     print("🔍 Scanning network...")
     
+    from ipanalyzer import NetworkScanner
     scanner = NetworkScanner()
     network_info = scanner.get_network_info()
     
@@ -286,14 +384,12 @@ def cmd_scan(args):
     }
     
     if args.json:
-        import json
         print(json.dumps(result, indent=2))
     else:
         print_devices_result(devices)
     
     if args.output:
-        generator = ReportGenerator()
-        html = generator.generate_html_report(result, args.output)
+        _save_report(result, args.output)
         print(f"\n✅ Report saved to: {args.output}")
 
 
@@ -305,6 +401,7 @@ def cmd_range(args):
     
     print(f"📊 Analyzing range: {args.cidr}")
     
+    from ipanalyzer import IPRangeAnalyzer
     analyzer = IPRangeAnalyzer()
     analysis = analyzer.analyze_cidr(args.cidr)
     
@@ -318,18 +415,15 @@ def cmd_range(args):
     if args.list_ips:
         ips = analyzer.generate_ip_list(args.cidr, args.limit)
         print(f"📋 IPs in range (limited to {args.limit}):")
-        for ip in ips:
-            print(f"   {ip}")
+        sys.stdout.write(''.join(f"   {ip}\n" for ip in ips))
     
     if args.json:
-        import json
-        print(json.dumps(result, indent=2))
+        print(_dumps(result))
     else:
         print_range_result(result['ranges'])
     
     if args.output:
-        generator = ReportGenerator()
-        html = generator.generate_html_report(result, args.output)
+        _save_report(result, args.output)
         print(f"✅ Report saved to: {args.output}")
 
 
@@ -341,6 +435,7 @@ def cmd_ports(args):
     
     print(f"🔒 Scanning ports on: {args.ip}")
     
+    from ipanalyzer import NetworkScanner
     scanner = NetworkScanner()
     
     ports = None
@@ -358,49 +453,72 @@ def cmd_ports(args):
     }
     
     if args.json:
-        import json
         print(json.dumps(result, indent=2))
     else:
         print_ports_result(args.ip, open_ports)
     
     if args.output:
-        generator = ReportGenerator()
-        html = generator.generate_html_report(result, args.output)
+        _save_report(result, args.output)
         print(f"\n✅ Report saved to: {args.output}")
 
 
 def cmd_batch(args):
     """Handle batch analysis command"""
-    if not os.path.exists(args.file):
-        print(f"❌ File not found: {args.file}")
-        return
-    
-    print(f"📂 Reading IPs from: {args.file}")
-    
-    with open(args.file, 'r') as f:
-        lines = f.read().strip().split('\n')
+    input_dir = getattr(args, 'input_dir', None)
+    if input_dir:
+        if not os.path.isdir(input_dir):
+            print(f"❌ Directory not found: {input_dir}")
+            return
+        print(f"📂 Reading IPs from directory: {input_dir}")
+        lines = _read_input_dir(input_dir, args.threads)
+    else:
+        if not os.path.exists(args.file):
+            print(f"❌ File not found: {args.file}")
+            return
+        
+        print(f"📂 Reading IPs from: {args.file}")
+        
+        with open(args.file, 'r') as f:
+            lines = f.read().strip().split('\n')
     
     print(f"📋 Found {len(lines)} entries\n")
     
-    whois_analyzer = WHOISAnalyzer()
+    entries, invalid = _classify_entries(lines)
+    for line in invalid:
+        print(f"⚠️  Skipping invalid entry: {line}")
+    
+    from ipanalyzer import IPRangeAnalyzer
+    whois_analyzer = _whois()
     range_analyzer = IPRangeAnalyzer()
-    results = []
     
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith('#'):
-            continue
-        
-        if '/' in line and IPValidator.is_valid_cidr(line):
-            print(f"📊 Analyzing range: {line}")
-            analysis = range_analyzer.analyze_cidr(line)
-            results.append(analysis)
-        elif IPValidator.is_valid_ipv4(line):
-            print(f"🔍 Analyzing IP: {line}")
-            analysis = whois_analyzer.analyze_ip(line)
-            results.append(analysis)
-        else:
-            print(f"⚠️  Skipping invalid entry: {line}")
+    def analyze(entry):
+        is_cidr, line = entry
+        if is_cidr:
+            return range_analyzer.analyze_cidr(line)
+        return whois_analyzer.analyze_ip(line)
+    
+    # Repeated entries are analyzed once and fanned back out in file order
+    unique = list(dict.fromkeys(entries))
+    
+    # Lookups are network-bound, so threads overlap the round-trips;
+    # executor.map yields in submission order
+    workers = max(1, min(args.threads, len(unique)))
+    analyses = {}
+    progress = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for entry, analysis in zip(unique, executor.map(analyze, unique)):
+            is_cidr, line = entry
+            if is_cidr:
+                progress.append(f"📊 Analyzing range: {line}")
+            else:
+                progress.append(f"🔍 Analyzing IP: {line}")
+            analyses[entry] = analysis
+            if len(progress) >= _PROGRESS_CHUNK:
+                print('\n'.join(progress), flush=True)
+                progress.clear()
+    if progress:
+        print('\n'.join(progress))
+    results = [analyses[entry] for entry in entries]
     
     print(f"\n✅ Analyzed {len(results)} entries\n")
     
@@ -411,42 +529,96 @@ def cmd_batch(args):
     }
     
     if args.json:
-        import json
-        print(json.dumps(result, indent=2))
-    else:
-        for r in results:
-            print(f"Entry: {r}")
+        print(_dumps(result))
+    elif results:
+        print('\n'.join(f"Entry: {r}" for r in results))
     
     if args.output:
-        generator = ReportGenerator()
-        html = generator.generate_html_report(result, args.output)
+        _save_report(result, args.output)
         print(f"✅ Report saved to: {args.output}")
 
 
 def print_whois_result(result):
     """Print WHOIS result in readable format"""
-    ip = result.get('ip')
-    classification = result.get('classification')
-    is_private = result.get('is_private')
     whois = result.get('whois', {})
-    
-    print(f"""
+    sys.stdout.write(_WHOIS_TMPL.format_map(_Default(
+        whois, 'N/A',
+        ip=result.get('ip'),
+        classification=result.get('classification'),
+        private='Yes' if result.get('is_private') else 'No',
+        timestamp=result.get('timestamp'),
+    )))
+
+
+class _Default(dict):
+    """format_map() mapping whose missing keys render like dict.get(key, default)"""
+
+    def __init__(self, data, default=None, **extra):
+        super().__init__(data, **extra)
+        self.default = default
+
+    def __missing__(self, key):
+        return self.default
+
+
+# Report templates: one format_map() per record, one write() per report
+_WHOIS_TMPL = """
 ╔════════════════════════════════════════════════════════════╗
 ║                    WHOIS ANALYSIS RESULT                   ║
 ╚════════════════════════════════════════════════════════════╝
 
 IP Address:          {ip}
 Classification:      {classification}
-Private:             {'Yes' if is_private else 'No'}
+Private:             {private}
 
-Organization:        {whois.get('organization', 'N/A')}
-Country:             {whois.get('country', 'N/A')}
-Range:               {whois.get('range', 'N/A')}
-RIR:                 {whois.get('rir', 'N/A')}
-Source:              {whois.get('source', 'N/A')}
+Organization:        {organization}
+Country:             {country}
+Range:               {range}
+RIR:                 {rir}
+Source:              {source}
 
-Timestamp:           {result.get('timestamp')}
-""")
+Timestamp:           {timestamp}
+
+"""
+_DEVICES_HEADER = (
+    "╔════════════════════════════════════════════════════════════════════════════════════════╗\n"
+    "║                          CONNECTED DEVICES                                            ║\n"
+    "╚════════════════════════════════════════════════════════════════════════════════════════╝\n\n"
+)
+_DEVICE_TMPL = (
+    "{index}. IP: {ip}\n"
+    "   MAC: {mac}\n"
+    "   Hostname: {hostname}\n"
+    "   Vendor: {vendor}\n"
+    "   Status: {status}\n\n"
+)
+_RANGE_HEADER = (
+    "╔════════════════════════════════════════════════════════════════╗\n"
+    "║                    IP RANGE ANALYSIS                          ║\n"
+    "╚════════════════════════════════════════════════════════════════╝\n\n"
+)
+_RANGE_TMPL = (
+    "CIDR:                {cidr}\n"
+    "Network IP:          {network_ip}\n"
+    "Broadcast IP:        {broadcast_ip}\n"
+    "Netmask:             {netmask}\n"
+    "Prefix Length:       /{prefix_length}\n"
+    "IP Class:            {ip_class}\n"
+    "Total Addresses:     {total_addresses}\n"
+    "Usable Hosts:        {usable_hosts}\n"
+    "First Usable IP:     {first_usable}\n"
+    "Last Usable IP:      {last_usable}\n\n"
+)
+_PORTS_HEADER = (
+    "╔════════════════════════════════════════════════════════════════╗\n"
+    "║                    PORT SCAN RESULT                           ║\n"
+    "╚════════════════════════════════════════════════════════════════╝\n\n"
+    "Target IP: {ip}\n\n"
+)
+_PORT_TMPL = (
+    "Port: {port} ({service})\n"
+    "Status: {status}\n\n"
+)
 
 
 def print_devices_result(devices):
@@ -455,89 +627,139 @@ def print_devices_result(devices):
         print("No devices found.")
         return
     
-    print("╔════════════════════════════════════════════════════════════════════════════════════════╗")
-    print("║                          CONNECTED DEVICES                                            ║")
-    print("╚════════════════════════════════════════════════════════════════════════════════════════╝\n")
-    
-    for i, device in enumerate(devices, 1):
-        print(f"{i}. IP: {device.get('ip', 'N/A')}")
-        print(f"   MAC: {device.get('mac', 'N/A')}")
-        print(f"   Hostname: {device.get('hostname', 'N/A')}")
-        print(f"   Vendor: {device.get('vendor', 'N/A')}")
-        print(f"   Status: {device.get('status', 'N/A')}")
-        print()
+    sys.stdout.write(_DEVICES_HEADER + ''.join(
+        _DEVICE_TMPL.format_map(_Default(device, 'N/A', index=i))
+        for i, device in enumerate(devices, 1)
+    ))
 
 
 def print_range_result(ranges):
     """Print IP range result in readable format"""
-    print("╔════════════════════════════════════════════════════════════════╗")
-    print("║                    IP RANGE ANALYSIS                          ║")
-    print("╚════════════════════════════════════════════════════════════════╝\n")
-    
-    for r in ranges:
-        print(f"CIDR:                {r.get('cidr')}")
-        print(f"Network IP:          {r.get('network_ip')}")
-        print(f"Broadcast IP:        {r.get('broadcast_ip')}")
-        print(f"Netmask:             {r.get('netmask')}")
-        print(f"Prefix Length:       /{r.get('prefix_length')}")
-        print(f"IP Class:            {r.get('ip_class')}")
-        print(f"Total Addresses:     {r.get('total_addresses')}")
-        print(f"Usable Hosts:        {r.get('usable_hosts')}")
-        print(f"First Usable IP:     {r.get('first_usable')}")
-        print(f"Last Usable IP:      {r.get('last_usable')}")
-        print()
+    sys.stdout.write(_RANGE_HEADER + ''.join(_RANGE_TMPL.format_map(_Default(r)) for r in ranges))
 
 
 def print_ports_result(ip, ports):
     """Print port scan result in readable format"""
-    print("╔════════════════════════════════════════════════════════════════╗")
-    print("║                    PORT SCAN RESULT                           ║")
-    print("╚════════════════════════════════════════════════════════════════╝\n")
+    body = ''.join(_PORT_TMPL.format_map(_Default(p)) for p in ports) if ports else "No open ports found.\n\n"
+    sys.stdout.write(_PORTS_HEADER.format(ip=ip) + body)
+
+
+# Subcommand table: (name, help, arguments, handler). Each argument is
+# (flags, kwargs); a list of them forms a required mutually exclusive group.
+_COMMANDS = (
+    ('whois', 'WHOIS lookup for IP address', (
+        (('ip',), {'help': 'IP address to analyze'}),
+        (('-o', '--output'), {'help': 'Output HTML file'}),
+        (('--json',), {'action': 'store_true', 'help': 'Output as JSON'}),
+    ), cmd_whois),
+    ('scan', 'Scan network for connected devices', (
+        (('--range',), {'help': 'Network range (e.g., 192.168.1.0/24)'}),
+        (('-o', '--output'), {'help': 'Output HTML file'}),
+        (('--json',), {'action': 'store_true', 'help': 'Output as JSON'}),
+        (('--ports',), {'help': 'Scan ports on discovered devices'}),
+    ), cmd_scan),
+    ('range', 'Analyze IP ranges and CIDR', (
+        (('cidr',), {'help': 'CIDR notation (e.g., 192.168.1.0/24)'}),
+        (('--subnet',), {'type': int, 'help': 'Divide into subnets with prefix'}),
+        (('--list-ips',), {'action': 'store_true', 'help': 'List all IPs in range'}),
+        (('--limit',), {'type': int, 'default': 1000, 'help': 'Limit IPs listed'}),
+        (('-o', '--output'), {'help': 'Output HTML file'}),
+        (('--json',), {'action': 'store_true', 'help': 'Output as JSON'}),
+    ), cmd_range),
+    ('ports', 'Scan ports on a host', (
+        (('ip',), {'help': 'IP address to scan'}),
+        (('--ports',), {'help': 'Comma-separated ports to scan'}),
+        (('-o', '--output'), {'help': 'Output HTML file'}),
+        (('--json',), {'action': 'store_true', 'help': 'Output as JSON'}),
+    ), cmd_ports),
+    ('batch', 'Batch analyze multiple IPs', (
+        [
+            (('file',), {'nargs': '?', 'help': 'File with IPs/CIDRs (one per line)'}),
+            (('--input-dir',), {'help': 'Directory of IP/CIDR list files to analyze together'}),
+        ],
+        (('-o', '--output'), {'help': 'Output HTML file'}),
+        (('--json',), {'action': 'store_true', 'help': 'Output as JSON'}),
+        (('--threads',), {'type': int, 'default': 16, 'help': 'Concurrent analyses (default: 16)'}),
+    ), cmd_batch),
+    ('geoip', 'GeoIP lookup (offline)', (
+        (('ip',), {'nargs': '?', 'help': 'IP address to lookup'}),
+        (('--file',), {'help': 'File with IPs (one per line)'}),
+    ), cmd_geoip),
+    ('dns', 'Bulk DNS processing', (
+        [
+            (('--forward',), {'help': 'File with hostnames for forward lookup'}),
+            (('--reverse',), {'help': 'File with IPs for reverse lookup'}),
+        ],
+        (('--threads',), {'type': int, 'default': 8, 'help': 'Number of threads'}),
+        (('--concurrency',), {'type': int, 'default': 1000, 'help': 'Maximum DNS queries in flight'}),
+    ), cmd_dns),
+    ('bgp', 'BGP route information (offline)', (
+        (('ip',), {'help': 'IP address to analyze'}),
+    ), cmd_bgp),
+    ('threat', 'Threat intelligence lookup', (
+        (('ip',), {'nargs': '?', 'help': 'IP address to check'}),
+    ), cmd_threat),
+    ('gui', 'Launch GUI application', (), cmd_gui),
+    ('db', 'Database storage operations', (
+        (('action',), {'choices': ['store', 'query'], 'help': 'Action'}),
+        (('--file',), {'help': 'File to store or import'}),
+        (('--ip',), {'help': 'IP to query'}),
+    ), cmd_db),
+    ('plugins', 'Plugin manager', (
+        (('--list',), {'action': 'store_true', 'help': 'List available plugins'}),
+        (('--exec',), {'dest': 'exec', 'action': 'store_true', 'help': 'Execute a plugin'}),
+        (('--plugin',), {'help': 'Plugin name to execute'}),
+        (('args',), {'nargs': '*', 'help': 'Arguments for plugin'}),
+    ), cmd_plugins),
+)
+
+
+_COMMAND_NAMES = frozenset(name for name, _, _, _ in _COMMANDS)
+
+
+def create_parser(command=None):
+    """
+    Create command-line argument parser
+    When `command` is given, only that subcommand's arguments are built;
+    the others are registered by name and help text alone
+    """
+    parser = argparse.ArgumentParser(
+        description='IPAnalyzer - Advanced IP Analysis Tool',
+        epilog='Created by MrAmirRezaie',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
     
-    print(f"Target IP: {ip}\n")
+    subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
-    if not ports:
-        print("No open ports found.\n")
-        return
+    for name, help_text, arguments, handler in _COMMANDS:
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.set_defaults(handler=handler)
+        if command is not None and name != command:
+            continue
+        for argument in arguments:
+            if isinstance(argument, list):
+                group = sub.add_mutually_exclusive_group(required=True)
+                for flags, kwargs in argument:
+                    group.add_argument(*flags, **kwargs)
+            else:
+                flags, kwargs = argument
+                sub.add_argument(*flags, **kwargs)
     
-    for port_info in ports:
-        print(f"Port: {port_info.get('port')} ({port_info.get('service')})")
-        print(f"Status: {port_info.get('status')}\n")
+    return parser
 
 
 def main():
     """Main entry point"""
-    parser = create_parser()
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+    command = argv[0] if argv and argv[0] in _COMMAND_NAMES else None
+    parser = create_parser(command)
+    args = parser.parse_args(argv)
     
     if not args.command:
         parser.print_help()
         return
     
-    # Ensure reports directory exists
-    os.makedirs('reports', exist_ok=True)
-    
-    # Route to appropriate command handler
-    commands = {
-        'whois': cmd_whois,
-        'scan': cmd_scan,
-        'range': cmd_range,
-        'ports': cmd_ports,
-        'batch': cmd_batch,
-        'geoip': cmd_geoip,
-        'dns': cmd_dns,
-        'bgp': cmd_bgp,
-        'threat': cmd_threat,
-        'gui': cmd_gui,
-        'db': cmd_db,
-        'plugins': cmd_plugins,
-    }
-    
-    handler = commands.get(args.command)
-    if handler:
-        handler(args)
-    else:
-        parser.print_help()
+    args.handler(args)
 
 
 if __name__ == '__main__':
@@ -4,6 +4,11 @@ Test script for Phase 2 modules
 Tests all four Phase 2 modules: GeoIP, BGP, DNS, and Threat Intelligence
 """
 
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from ipanalyzer.modules.geoip_analyzer import GeoIPAnalyzer
 from ipanalyzer.modules.bgp_analyzer import BGPAnalyzer
 from ipanalyzer.modules.dns_bulk_processor import DNSBulkProcessor
@@ -160,6 +165,36 @@ def test_threat_intelligence():
     print()
 
 
+class _ThreadLocalStdout:
+    """sys.stdout stand-in that sends each thread's prints to its own buffer"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+    
+    def _target(self):
+        buffer = getattr(self._local, 'buffer', None)
+        return self.stream if buffer is None else buffer
+    
+    def write(self, text):
+        return self._target().write(text)
+    
+    def flush(self):
+        self._target().flush()
+    
+    def capture(self, func):
+        """Run func, returning (captured_output, exception_or_None)"""
+        self._local.buffer = io.StringIO()
+        try:
+            func()
+            error = None
+        except Exception as e:
+            error = e
+        output = self._local.buffer.getvalue()
+        self._local.buffer = None
+        return output, error
+
+
 def main():
     """Run all tests"""
     print("\n")
@@ -168,11 +203,22 @@ def main():
     print("=" * 60)
     print()
     
+    # The suites are independent and mostly wait on I/O, so run them
+    # concurrently and replay each one's output in the usual order
+    tests = (test_geoip, test_bgp, test_dns, test_threat_intelligence)
+    stdout = _ThreadLocalStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            outcomes = list(executor.map(stdout.capture, tests))
+    finally:
+        sys.stdout = stdout.stream
+    
     try:
-        test_geoip()
-        test_bgp()
-        test_dns()
-        test_threat_intelligence()
+        for output, error in outcomes:
+            print(output, end='')
+            if error is not None:
+                raise error
         
         print("=" * 60)
         print("ALL PHASE 2 MODULES PASSED FUNCTIONAL TESTS!")
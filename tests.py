@@ -4,11 +4,6 @@ Author: MrAmirRezaie
 """
 
 import unittest
-import sys
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from ipanalyzer.modules.ip_utils import (
     IPValidator, IPConverter, CIDRCalculator, IPClassifier
@@ -23,29 +18,34 @@ class TestIPValidator(unittest.TestCase):
     
     def test_valid_ipv4(self):
         """Test valid IPv4 addresses"""
-        self.assertTrue(IPValidator.is_valid_ipv4("192.168.1.1"))
-        self.assertTrue(IPValidator.is_valid_ipv4("8.8.8.8"))
-        self.assertTrue(IPValidator.is_valid_ipv4("0.0.0.0"))
-        self.assertTrue(IPValidator.is_valid_ipv4("255.255.255.255"))
+        for value in ("192.168.1.1", "8.8.8.8", "0.0.0.0", "255.255.255.255"):
+            with self.subTest(value=value):
+                self.assertTrue(IPValidator.is_valid_ipv4(value))
     
     def test_invalid_ipv4(self):
         """Test invalid IPv4 addresses"""
-        self.assertFalse(IPValidator.is_valid_ipv4("256.256.256.256"))
-        self.assertFalse(IPValidator.is_valid_ipv4("192.168.1"))
-        self.assertFalse(IPValidator.is_valid_ipv4("invalid"))
-        self.assertFalse(IPValidator.is_valid_ipv4("192.168.1.1.1"))
+        for value in ("256.256.256.256", "192.168.1", "invalid", "192.168.1.1.1",
+                      "1.2.3.4\x00"):
+            with self.subTest(value=value):
+                self.assertFalse(IPValidator.is_valid_ipv4(value))
     
     def test_valid_cidr(self):
         """Test valid CIDR notation"""
-        self.assertTrue(IPValidator.is_valid_cidr("192.168.1.0/24"))
-        self.assertTrue(IPValidator.is_valid_cidr("10.0.0.0/8"))
-        self.assertTrue(IPValidator.is_valid_cidr("172.16.0.0/12"))
+        for value in ("192.168.1.0/24", "10.0.0.0/8", "172.16.0.0/12"):
+            with self.subTest(value=value):
+                self.assertTrue(IPValidator.is_valid_cidr(value))
     
     def test_invalid_cidr(self):
         """Test invalid CIDR notation"""
-        self.assertFalse(IPValidator.is_valid_cidr("192.168.1.0/33"))
-        self.assertFalse(IPValidator.is_valid_cidr("192.168.1.0"))
-        self.assertFalse(IPValidator.is_valid_cidr("invalid/24"))
+        for value in ("192.168.1.0/33", "192.168.1.0", "invalid/24"):
+            with self.subTest(value=value):
+                self.assertFalse(IPValidator.is_valid_cidr(value))
+    
+    def test_is_valid_cidr_batch(self):
+        """Test batch CIDR validation matches the scalar check"""
+        values = ["192.168.1.0/24", "10.0.0.0/8", "192.168.1.0/33", "192.168.1.0", "256.0.0.0/8"]
+        self.assertEqual(IPValidator.is_valid_cidr_batch(values),
+                         [IPValidator.is_valid_cidr(v) for v in values])
 
 
 class TestIPConverter(unittest.TestCase):
@@ -53,15 +53,33 @@ class TestIPConverter(unittest.TestCase):
     
     def test_ip_to_int(self):
         """Test IP to integer conversion"""
-        self.assertEqual(IPConverter.ip_to_int("0.0.0.0"), 0)
-        self.assertEqual(IPConverter.ip_to_int("255.255.255.255"), 4294967295)
-        self.assertEqual(IPConverter.ip_to_int("192.168.1.1"), 3232235777)
+        cases = {
+            "0.0.0.0": 0,
+            "255.255.255.255": 4294967295,
+            "192.168.1.1": 3232235777,
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                self.assertEqual(IPConverter.ip_to_int(value), expected)
     
     def test_int_to_ip(self):
         """Test integer to IP conversion"""
-        self.assertEqual(IPConverter.int_to_ip(0), "0.0.0.0")
-        self.assertEqual(IPConverter.int_to_ip(4294967295), "255.255.255.255")
-        self.assertEqual(IPConverter.int_to_ip(3232235777), "192.168.1.1")
+        cases = {
+            0: "0.0.0.0",
+            4294967295: "255.255.255.255",
+            3232235777: "192.168.1.1",
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                self.assertEqual(IPConverter.int_to_ip(value), expected)
+    
+    def test_ints_to_ips(self):
+        """Test batch integer to IP conversion matches the scalar path"""
+        for cidr in ("192.168.1.0/24", "10.20.0.0/16"):
+            start, end = CIDRCalculator.get_ip_range(cidr)
+            nums = range(start, end + 1)
+            self.assertEqual(IPConverter.ints_to_ips(nums),
+                             [IPConverter.int_to_ip(n) for n in nums])
 
 
 class TestCIDRCalculator(unittest.TestCase):
@@ -87,6 +105,21 @@ class TestCIDRCalculator(unittest.TestCase):
         subnets = CIDRCalculator.subnets_from_cidr("192.168.1.0/24", 26)
         self.assertEqual(len(subnets), 4)
         self.assertIn("192.168.1.0/26", subnets)
+    
+    def test_subnets_from_cidr_lazy(self):
+        """Test huge subnet divisions are not materialized"""
+        subnets = CIDRCalculator.subnets_from_cidr("10.0.0.0/8", 32)
+        self.assertEqual(len(subnets), 1 << 24)
+        self.assertEqual(subnets[-1], "10.255.255.255/32")
+        self.assertEqual(subnets[1:3], ["10.0.0.1/32", "10.0.0.2/32"])
+        self.assertIn("10.1.2.3/32", subnets)
+        self.assertNotIn("10.1.2.3/31", subnets)
+    
+    def test_subnets_from_cidr_no_split(self):
+        """Test a prefix no longer than the block yields the block itself"""
+        subnets = CIDRCalculator.subnets_from_cidr("192.168.1.0/24", 24)
+        self.assertEqual(list(subnets), ["192.168.1.0/24"])
+        self.assertEqual(type(subnets), type(CIDRCalculator.subnets_from_cidr("192.168.1.0/24", 26)))
 
 
 class TestIPClassifier(unittest.TestCase):
@@ -94,30 +127,51 @@ class TestIPClassifier(unittest.TestCase):
     
     def test_is_private(self):
         """Test private IP detection"""
-        self.assertTrue(IPClassifier.is_private("192.168.1.1"))
-        self.assertTrue(IPClassifier.is_private("10.0.0.1"))
-        self.assertTrue(IPClassifier.is_private("172.16.0.1"))
-        self.assertFalse(IPClassifier.is_private("8.8.8.8"))
+        cases = {
+            "192.168.1.1": True,
+            "10.0.0.1": True,
+            "172.16.0.1": True,
+            "8.8.8.8": False,
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                self.assertEqual(IPClassifier.is_private(value), expected)
     
     def test_is_loopback(self):
         """Test loopback IP detection"""
-        self.assertTrue(IPClassifier.is_loopback("127.0.0.1"))
-        self.assertTrue(IPClassifier.is_loopback("127.255.255.255"))
-        self.assertFalse(IPClassifier.is_loopback("128.0.0.1"))
+        cases = {
+            "127.0.0.1": True,
+            "127.255.255.255": True,
+            "128.0.0.1": False,
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                self.assertEqual(IPClassifier.is_loopback(value), expected)
     
     def test_classify(self):
         """Test IP classification"""
-        self.assertEqual(IPClassifier.classify("192.168.1.1"), "Private")
-        self.assertEqual(IPClassifier.classify("8.8.8.8"), "Public")
-        self.assertEqual(IPClassifier.classify("127.0.0.1"), "Loopback")
+        cases = {
+            "192.168.1.1": "Private",
+            "8.8.8.8": "Public",
+            "127.0.0.1": "Loopback",
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                self.assertEqual(IPClassifier.classify(value), expected)
+    
+    def test_classify_batch(self):
+        """Test batch classification matches classify()"""
+        ips = ["192.168.1.1", "8.8.8.8", "127.0.0.1", "169.254.1.1", "172.32.0.1"]
+        self.assertEqual(IPClassifier.classify_batch(ips), [IPClassifier.classify(ip) for ip in ips])
 
 
 class TestWHOISAnalyzer(unittest.TestCase):
     """Test WHOIS analyzer functions"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.analyzer = WHOISAnalyzer()
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by the class"""
+        cls.analyzer = WHOISAnalyzer()
     
     def test_analyze_private_ip(self):
         """Test WHOIS analysis of private IP"""
@@ -135,9 +189,10 @@ class TestWHOISAnalyzer(unittest.TestCase):
 class TestIPRangeAnalyzer(unittest.TestCase):
     """Test IP range analyzer functions"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.analyzer = IPRangeAnalyzer()
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by the class"""
+        cls.analyzer = IPRangeAnalyzer()
     
     def test_analyze_cidr(self):
         """Test CIDR analysis"""
@@ -162,40 +217,51 @@ class TestIPRangeAnalyzer(unittest.TestCase):
         """Test overlap detection"""
         self.assertTrue(self.analyzer.find_overlaps("192.168.1.0/24", "192.168.1.0/25"))
         self.assertFalse(self.analyzer.find_overlaps("192.168.1.0/24", "192.168.2.0/24"))
+    
+    def test_batch_range_checks(self):
+        """Test matrix forms of range membership and overlap"""
+        cidrs = ["192.168.1.0/24", "10.0.0.0/8"]
+        self.assertEqual(self.analyzer.ips_in_ranges(["192.168.1.50", "10.9.9.9", "8.8.8.8"], cidrs),
+                         [[True, False], [False, True], [False, False]])
+        self.assertEqual(self.analyzer.find_overlaps_many(["192.168.1.0/25", "10.1.0.0/16"], cidrs),
+                         [[True, False], [False, True]])
 
 
 class TestNetworkScanner(unittest.TestCase):
     """Test network scanner functions"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.scanner = NetworkScanner()
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by the class"""
+        cls.scanner = NetworkScanner()
+        # Both consult the OS routing table; look them up once
+        cls.local_ip = cls.scanner.get_local_ip()
+        cls.net_info = cls.scanner.get_network_info()
     
     def test_get_local_ip(self):
         """Test local IP detection"""
-        local_ip = self.scanner.get_local_ip()
+        local_ip = self.local_ip
         self.assertIsNotNone(local_ip)
         self.assertTrue(IPValidator.is_valid_ipv4(local_ip))
     
     def test_get_network_info(self):
         """Test network info retrieval"""
-        net_info = self.scanner.get_network_info()
+        net_info = self.net_info
         self.assertIn('local_ip', net_info)
         self.assertIn('gateway', net_info)
         self.assertIn('os', net_info)
     
-    def test_ping_host(self):
-        """Test ping functionality"""
-        # Ping localhost - should always work
-        result = self.scanner.ping_host("127.0.0.1")
-        self.assertTrue(result)
-    
     def test_get_service_name(self):
         """Test service name lookup"""
-        self.assertEqual(NetworkScanner.get_service_name(22), "SSH")
-        self.assertEqual(NetworkScanner.get_service_name(80), "HTTP")
-        self.assertEqual(NetworkScanner.get_service_name(443), "HTTPS")
-        self.assertEqual(NetworkScanner.get_service_name(65535), "Unknown")
+        cases = {
+            22: "SSH",
+            80: "HTTP",
+            443: "HTTPS",
+            65535: "Unknown",
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                self.assertEqual(NetworkScanner.get_service_name(value), expected)
 
 
 def run_tests():
@@ -0,0 +1,34 @@
+"""Shared pytest configuration for the IPAnalyzer test suite"""
+import pytest
+
+from ipanalyzer.modules.ip_range_analyzer import IPRangeAnalyzer
+from ipanalyzer.modules.whois_analyzer import WHOISAnalyzer
+
+
+@pytest.fixture(scope='session')
+def whois():
+    """One WHOISAnalyzer for the run, so its lookup cache stays warm across tests"""
+    return WHOISAnalyzer()
+
+
+@pytest.fixture(scope='session')
+def range_analyzer():
+    return IPRangeAnalyzer()
+
+
+def pytest_addoption(parser):
+    parser.addoption('--run-integration', action='store_true', default=False,
+                     help='also run tests marked integration (live network)')
+
+
+def pytest_collection_modifyitems(config, items):
+    # Under pytest-xdist with --dist=loadgroup, network tests share one
+    # worker while the pure-logic tests spread across the rest
+    group = pytest.mark.xdist_group('network')
+    skip = pytest.mark.skip(reason='needs --run-integration')
+    run_integration = config.getoption('--run-integration')
+    for item in items:
+        if item.get_closest_marker('network') is not None:
+            item.add_marker(group)
+        if not run_integration and item.get_closest_marker('integration') is not None:
+            item.add_marker(skip)
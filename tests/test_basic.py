@@ -1,4 +1,7 @@
 import json
+
+import pytest
+
 from ipanalyzer import GeoIPAnalyzer, BGPAnalyzer, DNSBulkProcessor, ThreatIntel, IPUtils
 
 
@@ -14,6 +17,7 @@ def test_bgp():
     assert 'asn' in r
 
 
+@pytest.mark.network
 def test_dnsbulk_resolve():
     d = DNSBulkProcessor()
     # localhost should always resolve
@@ -30,3 +34,32 @@ def test_threat():
 def test_iputils():
     assert IPUtils.is_valid_ip('8.8.8.8')
     assert IPUtils.is_ipv4('8.8.8.8')
+
+
+def test_threat_report_csv():
+    import csv
+    from ipanalyzer import ThreatIntelligence
+    t = ThreatIntelligence()
+    t.analyze_threat('192.0.2.1')
+    rows = list(csv.reader(t.export_threat_report('192.0.2.1', format='csv').splitlines()))
+    assert rows[0] == ['IP', 'ThreatLevel', 'RiskScore', 'ThreatTypes', 'LastSeen']
+    assert rows[1][:3] == ['192.0.2.1', 'CRITICAL', '95']
+
+
+def test_threat_blacklist_cidr(tmp_path):
+    from ipanalyzer import ThreatIntelligence
+    bl = tmp_path / 'blacklist.txt'
+    bl.write_text('# nets\n10.0.0.0/8\n192.168.16.0/20\n2001:db8::/32\n')
+    wl = tmp_path / 'whitelist.txt'
+    wl.write_text('\n10.0.0.9\r\n')
+    t = ThreatIntelligence(blacklist_path=str(bl), whitelist_path=str(wl))
+    assert t.is_whitelisted('10.0.0.9')
+    assert t.is_blacklisted('10.20.30.40')
+    assert t.is_blacklisted('192.168.31.1')
+    assert not t.is_blacklisted('192.168.32.1')
+    assert t.is_blacklisted('2001:db8::1')
+    t.add_to_blacklist('172.16.0.5')
+    assert t.is_blacklisted('172.16.0.5')
+    t.remove_from_blacklist('172.16.0.5')
+    assert not t.is_blacklisted('172.16.0.5')
+    assert 'blacklist' in t.analyze_threat('10.0.0.1')['threat_types']
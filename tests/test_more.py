@@ -1,16 +1,286 @@
-from ipanalyzer.modules.whois_analyzer import WHOISAnalyzer
-from ipanalyzer.modules.ip_range_analyzer import IPRangeAnalyzer
+import pytest
 
 
-def test_iprange():
-    a = IPRangeAnalyzer()
-    info = a.analyze_cidr('192.168.1.0/24')
+def test_iprange(range_analyzer):
+    info = range_analyzer.analyze_cidr('192.168.1.0/24')
     assert info['total_addresses'] == 256
-    subs = a.subnet_division('192.168.0.0/16', 24)
+    subs = range_analyzer.subnet_division('192.168.0.0/16', 24)
     assert '192.168.0.0/24' in subs
 
 
-def test_whois_format():
-    w = WHOISAnalyzer()
-    r = w.lookup('8.8.8.8')
+def test_whois_format(whois):
+    r = whois.lookup('8.8.8.8')
     assert 'ip' in r and r['ip'] == '8.8.8.8'
+
+
+def test_db_bulk_store(tmp_path):
+    from ipanalyzer import DatabaseManager
+    db = DatabaseManager(db_path=str(tmp_path / 'results.sqlite'))
+    stored = db.store_analyses_bulk([('batch', {'ip': '1.1.1.1'}), ('batch', {'ip': '2.2.2.2'})])
+    assert stored == 2
+    assert len(db.query_history('2.2.2.2')) == 1
+    assert db.query_history('1.1.1.1')[0]['data'] == {'ip': '1.1.1.1'}
+
+
+def test_whois_persistent_cache(tmp_path):
+    from ipanalyzer import DatabaseManager, WHOISAnalyzer
+    db = DatabaseManager(db_path=str(tmp_path / 'results.sqlite'))
+    first = WHOISAnalyzer(cache_db=db).analyze_ip('8.8.8.8')
+    assert db.get_whois_cache('8.8.8.8')['whois'] == first['whois']
+    assert WHOISAnalyzer(cache_db=db).analyze_ip('8.8.8.8')['timestamp'] == first['timestamp']
+
+
+def test_plugin_module_reused(tmp_path):
+    from ipanalyzer.plugins.plugin_manager import PluginManager
+    plugin = tmp_path / 'echo'
+    plugin.mkdir()
+    (plugin / 'plugin.json').write_text('{"name": "echo", "main": "main.py"}')
+    (plugin / 'main.py').write_text('def run(x):\n    return x\n')
+    first = PluginManager(str(tmp_path))
+    assert first.execute_plugin('echo', 3) == 3
+    assert PluginManager(str(tmp_path)).plugins['echo']['module'] is first.plugins['echo']['module']
+    assert (tmp_path / '_index.json').exists()
+    (plugin / 'plugin.json').write_text('{"name": "echo2", "main": "main.py"}')
+    assert PluginManager(str(tmp_path)).list_plugins() == ['echo2']
+
+
+def test_db_cleanup_old_records(tmp_path):
+    from ipanalyzer import DatabaseManager
+    db = DatabaseManager(db_path=str(tmp_path / 'results.sqlite'))
+    with db.conn:
+        db.conn.executemany('INSERT INTO analyses (ip, analysis_type, data, created_at) VALUES (?, ?, ?, ?)',
+                            [('1.1.1.1', 'old', '{}', '2000-01-01T00:00:00')] * 5)
+    db.store_analysis('new', {'ip': '1.1.1.1'})
+    assert db.cleanup_old_records(days=1, batch_size=2) == 5
+    assert [r['type'] for r in db.query_history('1.1.1.1')] == ['new']
+
+
+def test_whois_referral_cached_per_octet(monkeypatch):
+    from ipanalyzer.modules import whois_analyzer
+    monkeypatch.setattr(whois_analyzer, '_REFERRAL_CACHE', {})
+    w = whois_analyzer.WHOISAnalyzer()
+    queries = []
+    monkeypatch.setattr(w, '_query_server', lambda server, query, timeout=5:
+                        queries.append((server, query)) or 'refer:        whois.ripe.net\n')
+    assert w.find_referral_server('5.1.1.1') == 'whois.ripe.net'
+    assert w.find_referral_server('5.2.2.2') == 'whois.ripe.net'
+    assert queries == [('whois.iana.org', '5.1.1.1')]
+
+
+def test_whois_live_lookup_uses_cached_referral(monkeypatch):
+    from ipanalyzer.modules import whois_analyzer
+    monkeypatch.setattr(whois_analyzer, '_REFERRAL_CACHE', {})
+    w = whois_analyzer.WHOISAnalyzer()
+    queries = []
+
+    def fake_query(server, query, timeout=5):
+        queries.append(server)
+        return 'refer:        whois.afrinic.net\n' if server == 'whois.iana.org' else 'OrgName: Example\n'
+
+    monkeypatch.setattr(w, '_query_server', fake_query)
+    assert w.analyze_ip('41.1.1.1')['whois']['source'] == 'live_whois'
+    assert w.analyze_ip('41.2.2.2')['whois']['organization'] == 'Example'
+    assert queries == ['whois.iana.org', 'whois.afrinic.net', 'whois.afrinic.net']
+
+
+def test_whois_server_address_cached(monkeypatch):
+    from ipanalyzer.modules import whois_analyzer
+    monkeypatch.setattr(whois_analyzer, '_SERVER_ADDRS', {})
+    calls = []
+    monkeypatch.setattr(whois_analyzer.socket, 'getaddrinfo', lambda host, port, **kw:
+                        calls.append(host) or [(2, 1, 6, '', ('192.0.2.1', port))])
+    assert whois_analyzer._server_address('whois.example', 43) == ('192.0.2.1', 43)
+    assert whois_analyzer._server_address('whois.example', 43) == ('192.0.2.1', 43)
+    assert calls == ['whois.example']
+
+
+def test_db_export_csv_stream(tmp_path):
+    import csv
+    import io
+    from ipanalyzer import DatabaseManager
+    db = DatabaseManager(db_path=str(tmp_path / 'results.sqlite'))
+    db.store_analysis('note', {'ip': '1.1.1.1', 'text': 'a, "b"'})
+    out = io.StringIO()
+    assert db.export_data(file=out) is None
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows[0] == ['id', 'ip', 'analysis_type', 'created_at', 'data']
+    assert rows[1][4] == '{"ip":"1.1.1.1","text":"a, \\"b\\""}'
+    assert db.export_data() == out.getvalue().rstrip('\n')
+
+
+def test_db_large_payload_compressed(tmp_path):
+    from ipanalyzer import DatabaseManager
+    db = DatabaseManager(db_path=str(tmp_path / 'results.sqlite'))
+    data = {'ip': '1.1.1.1', 'threat_level': 'HIGH', 'raw': 'x' * 4096}
+    db.store_analysis('whois', data)
+    text, blob = db.conn.execute('SELECT data, payload FROM analyses').fetchone()
+    assert text is None and len(blob) < 1024
+    assert db.query_history('1.1.1.1')[0]['data'] == data
+    assert [r['data'] for r in db.query_threat_level('HIGH')] == [data]
+
+
+def test_db_threat_level_column_backfilled(tmp_path):
+    import json
+    import sqlite3
+    import zlib
+    from ipanalyzer import DatabaseManager
+    path = str(tmp_path / 'results.sqlite')
+    big = {'ip': '2.2.2.2', 'threat_level': 'HIGH', 'raw': 'x' * 4096}
+    old = sqlite3.connect(path)
+    old.execute('CREATE TABLE analyses (id INTEGER PRIMARY KEY AUTOINCREMENT, ip TEXT, '
+                'analysis_type TEXT, data TEXT, created_at TEXT, payload BLOB)')
+    old.execute('INSERT INTO analyses (ip, analysis_type, data, created_at) VALUES (?, ?, ?, ?)',
+                ('1.1.1.1', 'threat', json.dumps({'ip': '1.1.1.1', 'threat_level': 'LOW'}), '2024-01-01'))
+    old.execute('INSERT INTO analyses (ip, analysis_type, payload, created_at) VALUES (?, ?, ?, ?)',
+                ('2.2.2.2', 'whois', b'\x01' + zlib.compress(json.dumps(big).encode()), '2024-01-02'))
+    old.execute('PRAGMA user_version = 2')
+    old.commit()
+    old.close()
+    db = DatabaseManager(db_path=path)
+    assert [r['ip'] for r in db.query_threat_level('LOW')] == ['1.1.1.1']
+    assert [r['data'] for r in db.query_threat_level('HIGH')] == [big]
+    plan = ' '.join(row[-1] for row in db.conn.execute(
+        'EXPLAIN QUERY PLAN SELECT id FROM analyses WHERE threat_level = ? ORDER BY created_at DESC',
+        ('HIGH',)))
+    assert 'idx_threat_level' in plan
+
+
+def test_dns_iter_export_matches_export():
+    from ipanalyzer import DNSBulkProcessor
+    proc = DNSBulkProcessor()
+    res = {'a.example': {'hostname': 'a.example', 'ips': ['1.2.3.4'], 'error': None}}
+    for fmt in ('csv', 'json', 'txt'):
+        assert '\n'.join(proc.iter_export_results(res, fmt)) == proc.export_results(res, fmt)
+
+
+@pytest.mark.network
+def test_dns_forward_batch_async_localhost():
+    import asyncio
+    from ipanalyzer import DNSBulkProcessor
+    proc = DNSBulkProcessor()
+    res = asyncio.run(proc.forward_lookup_batch_async(['localhost', 'localhost'], concurrency=2))
+    assert list(res) == ['localhost']
+    assert res['localhost']['error'] is None and res['localhost']['ips']
+
+
+
+def test_dns_forward_batch_async_slow_resolver_not_timed_out():
+    # Time spent waiting for a worker thread must not count against the timeout
+    import asyncio
+    import time
+    from unittest import mock
+    from ipanalyzer import DNSBulkProcessor
+    from ipanalyzer.modules import dns_bulk_processor
+
+    def slow_getaddrinfo(host, port):
+        time.sleep(0.2)
+        return [(2, 1, 6, '', ('192.0.2.1', 0))]
+
+    proc = DNSBulkProcessor(timeout=1)
+    hosts = [f'h{i}.example' for i in range(60)]
+    with mock.patch.object(dns_bulk_processor.socket, 'getaddrinfo', slow_getaddrinfo):
+        res = asyncio.run(proc.forward_lookup_batch_async(hosts, concurrency=10))
+    assert [r['error'] for r in res.values()] == [None] * len(hosts)
+
+@pytest.mark.network
+def test_dns_resolve_many_keeps_order():
+    from ipanalyzer import DNSBulkProcessor
+    proc = DNSBulkProcessor()
+    res = proc.resolve_many(['localhost', 'localhost'])
+    assert [r['host'] for r in res] == ['localhost', 'localhost']
+    assert res[0] == proc.resolve('localhost')
+
+
+def test_lru_cache_evicts_least_recent():
+    from ipanalyzer.modules._lrucache import LRUCache
+    cache = LRUCache(maxsize=2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.get('a') == 1  # 'b' is now the least recent
+    cache['c'] = 3
+    assert list(cache) == ['a', 'c']
+    assert cache.get('b') is None
+
+
+def test_lru_cache_copy_and_repr_keep_entries_and_order():
+    import pickle
+    from ipanalyzer.modules._lrucache import LRUCache
+    cache = LRUCache(maxsize=10)
+    for i in range(5):
+        cache[i] = str(i)
+    assert list(cache.copy()) == [0, 1, 2, 3, 4]
+    repr(cache)
+    assert list(pickle.loads(pickle.dumps(cache))) == [0, 1, 2, 3, 4]
+    assert list(cache) == [0, 1, 2, 3, 4]
+
+
+def test_ping_host_unit():
+    from unittest import mock
+    from ipanalyzer.modules import network_scanner
+    scanner = network_scanner.NetworkScanner()
+    # ICMP sockets unavailable: falls back to the ping command
+    with mock.patch.object(network_scanner, '_icmp_echo', return_value=None), \
+            mock.patch.object(network_scanner.subprocess, 'run') as run:
+        run.return_value.returncode = 0
+        assert scanner.ping_host('127.0.0.1')
+        assert '127.0.0.1' in run.call_args[0][0]
+        run.return_value.returncode = 1
+        assert not scanner.ping_host('127.0.0.1')
+    # An ICMP answer is final; the ping command is not spawned
+    with mock.patch.object(network_scanner, '_icmp_echo', return_value=True), \
+            mock.patch.object(network_scanner.subprocess, 'run') as run:
+        assert scanner.ping_host('127.0.0.1')
+        run.assert_not_called()
+
+
+@pytest.mark.integration
+@pytest.mark.network
+def test_ping_host_live():
+    from ipanalyzer.modules.network_scanner import NetworkScanner
+    assert NetworkScanner().ping_host('127.0.0.1')
+
+
+def test_cli_classify_nul_line_is_invalid():
+    import ipanalyzer_cli
+    lines = ['1.2.3.4', 'bad\x00line', '10.0.0.0/8']
+    assert ipanalyzer_cli._classify_plain(lines[:2]) == ([(False, '1.2.3.4')], ['bad\x00line'])
+    assert ipanalyzer_cli._classify_mixed(lines)[1] == ['bad\x00line']
+
+
+def test_icmp_echo_strips_ip_header_on_datagram_socket():
+    # macOS/BSD datagram ICMP sockets hand back the IPv4 header as well
+    from unittest import mock
+    from ipanalyzer.modules import network_scanner
+
+    class FakeSocket:
+        def __init__(self, *args):
+            self.reply = b''
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def fileno(self):
+            return -1
+
+        def sendto(self, packet, addr):
+            ip_header = bytes([0x45]) + bytes(19)
+            self.reply = ip_header + bytes([0, 0]) + packet[2:]
+
+        def recvfrom(self, size):
+            return self.reply, ('127.0.0.1', 0)
+
+    with mock.patch.object(network_scanner.socket, 'socket', FakeSocket), \
+            mock.patch.object(network_scanner.select, 'select', lambda r, w, x, t: (r, w, x)):
+        assert network_scanner._icmp_echo('127.0.0.1', 1) is True
+
+
+def test_cli_read_entries_splits_on_lines(tmp_path):
+    import ipanalyzer_cli
+    path = tmp_path / 'hosts.txt'
+    path.write_bytes(b'example.com\r\n\n  # bad hosts  \n8.8.8.8')
+    assert ipanalyzer_cli._read_entries(str(path)) == ['example.com', '# bad hosts', '8.8.8.8']
+    path.write_bytes(b'')
+    assert ipanalyzer_cli._read_entries(str(path)) == []